@@ -1,6 +1,8 @@
 """Manual test for the replication system demonstrating multi-layer architecture."""
 import asyncio
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 from src.node.core_node import CoreNode
 from src.node.first_layer_node import FirstLayerNode
@@ -8,10 +10,25 @@ from src.node.second_layer_node import SecondLayerNode
 from src.node.base_node import BaseNode  # Also needed for execute_transaction
 from src.transaction.parser import TransactionParser
 import sys
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
+
 logger = logging.getLogger("manual_test")
 
-def setup_logging():
-    """Set up logging configuration."""
+def setup_logging() -> logging.handlers.QueueListener:
+    """Set up logging configuration.
+
+    Nodes only enqueue their records; a listener thread formats them and
+    writes them to the log file and console, keeping that I/O off the
+    event loop.
+
+    Returns:
+        The started listener, to be stopped on shutdown so queued
+        records are flushed
+    """
     root_logger = logging.getLogger()
     root_logger.handlers = []
 
@@ -53,12 +70,18 @@ def setup_logging():
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(detailed_formatter)
 
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+
     root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     root_logger.info("Logging system initialized")
     root_logger.info(f"Log files will be written to: {log_dir.absolute()}")
+    return listener
 
 async def start_nodes_in_order(nodes: list) -> None:
     """Start nodes in the correct order and wait for each to be ready."""
@@ -68,7 +91,6 @@ async def start_nodes_in_order(nodes: list) -> None:
         await node.start()
         await node.wait_for_ready()
         logger.info(f"Node {node.node_id} is ready", extra=extra)
-        await asyncio.sleep(0.1)
 
 async def execute_transaction(node: BaseNode, tx_str: str) -> None:
     """Execute a transaction on a node."""
@@ -99,6 +121,12 @@ def cleanup_files():
         file.unlink()
 
 async def main():
+    # From Python 3.12, start tasks eagerly so ones that finish or block
+    # right away skip a trip through the event loop
+    eager_task_factory = getattr(asyncio, 'eager_task_factory', None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+
     # Initialize nodes
     c2 = SecondLayerNode("C2", "logs/c2", 5007, is_primary=False)
     c1 = SecondLayerNode("C1", "logs/c1", 5006, is_primary=True,
@@ -187,5 +215,12 @@ async def main():
         cleanup_files()
 
 if __name__ == "__main__":
-    setup_logging()
-    asyncio.run(main())
\ No newline at end of file
+    listener = setup_logging()
+    try:
+        if uvloop is not None:
+            logger.info("Running on the uvloop event loop")
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
+    finally:
+        listener.stop()
\ No newline at end of file
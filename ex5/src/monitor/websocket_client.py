@@ -5,6 +5,7 @@ import logging
 import websockets
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime
+from src.node.channels import backoff_delay
 
 class NodeWebSocketClient:
     def __init__(self, node_id: str, layer: int, websocket_url: str = "ws://localhost:8000"):
@@ -21,6 +22,12 @@ class NodeWebSocketClient:
         self._send_state_task = None
         self._get_current_data: Callable[[], Dict[str, Any]] = lambda: {}
         self._get_operation_log: Callable[[], list] = lambda: []
+        # Set whenever the state shown to the monitor changes
+        self._state_changed = asyncio.Event()
+        # Most often state is sent, so a burst of changes goes out once
+        self._min_send_interval = 0.25
+        # State is resent this often even when nothing changed
+        self._heartbeat_interval = 5.0
 
     async def start(self):
         """Start the WebSocket client."""
@@ -43,7 +50,7 @@ class NodeWebSocketClient:
 
     async def _maintain_connection(self):
         """Maintain WebSocket connection with reconnection logic."""
-        retry_count = 0
+        attempt = 0
         while not self._closed:
             try:
                 if not self.is_connected:
@@ -52,33 +59,44 @@ class NodeWebSocketClient:
                     initial_state = await self._gather_node_state()
                     await self.websocket.send(json.dumps(initial_state))
                     self.is_connected = True
-                    retry_count = 0
+                    attempt = 0
                     self._logger.info("Successfully connected to WebSocket server")
-                await asyncio.sleep(0.1)  # Check connection status more frequently
+                # Sleep until the server goes away instead of polling for it
+                await self.websocket.wait_closed()
+                self._logger.warning("WebSocket connection closed")
+                self.is_connected = False
             except Exception as e:
                 self._logger.error(f"WebSocket connection error: {e}")
                 self.is_connected = False
-                retry_count += 1
-                await asyncio.sleep(min(1 * retry_count, 5))  # Exponential backoff up to 5 seconds
+                # Jittered, so nodes that lost the monitor together spread out
+                await asyncio.sleep(backoff_delay(attempt, maximum=5.0))
+                attempt = min(attempt + 1, 10)
 
     async def _send_state_periodically(self):
-        """Send node state periodically."""
+        """Send node state when it changes, and as a heartbeat otherwise."""
         while not self._closed:
             try:
+                try:
+                    await asyncio.wait_for(self._state_changed.wait(), timeout=self._heartbeat_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._state_changed.clear()
                 if self.is_connected and self.websocket:
                     state = await self._gather_node_state()
                     if state["current_data"]:  # Only send if we have data
-                        self._logger.debug(f"Sending state update: {state}")
+                        self._logger.debug("Sending state update: %s", state)
                         await self.websocket.send(json.dumps(state))
-                await asyncio.sleep(0.1)  # Send state more frequently
             except websockets.exceptions.ConnectionClosed:
                 self._logger.warning("WebSocket connection closed")
                 self.is_connected = False
             except Exception as e:
                 self._logger.error(f"Error sending state: {e}")
                 self.is_connected = False
+                if self.websocket:
+                    # _maintain_connection reconnects once the socket is closed
+                    await self.websocket.close()
             finally:
-                await asyncio.sleep(0.1)
+                await asyncio.sleep(self._min_send_interval)
 
     async def _gather_node_state(self) -> Dict[str, Any]:
         """Gather current node state."""
@@ -108,7 +126,23 @@ class NodeWebSocketClient:
     def update_sync_time(self):
         """Update the last sync time."""
         self.last_sync_time = datetime.now().isoformat()
+        self._state_changed.set()
+
+    def increment_update_count(self, count: int = 1):
+        """Add count updates to the update counter.
 
-    def increment_update_count(self):
-        """Increment the update counter."""
-        self.update_count += 1
\ No newline at end of file
+        Only the local counter changes here; the monitor sees it with the
+        next state sent by _send_state_periodically.
+        """
+        self.update_count += count
+        self._state_changed.set()
+
+    def record_updates(self, count: int = 1):
+        """Add count stored updates to the counter and mark the node as synced.
+
+        Same as increment_update_count followed by update_sync_time, for
+        the sync handlers that always do both.
+        """
+        self.update_count += count
+        self.last_sync_time = datetime.now().isoformat()
+        self._state_changed.set()
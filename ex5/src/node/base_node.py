@@ -2,6 +2,7 @@
 import asyncio
 import grpc
 from src.storage.data_store import DataStore
+from src.node.channels import SERVER_OPTIONS
 from src.proto import replication_pb2, replication_pb2_grpc
 from src.monitor.websocket_client import NodeWebSocketClient
 import logging
@@ -40,19 +41,35 @@ class BaseNode(replication_pb2_grpc.NodeServiceServicer):
         self.server = None
         self._closed = False
         self._ready = asyncio.Event()
+        # Fields of NodeStatus that never change, copied into each response
+        self._status_template = replication_pb2.NodeStatus(node_id=node_id, layer=layer)
+        # Last status built, reused until the store changes
+        self._status_cache = None
+        self._status_cache_sequence = -1
+        # Monitoring view of the store, as of this change sequence
+        self._websocket_data: Dict[str, str] = {}
+        self._websocket_data_sequence = 0
         self._logger = logging.getLogger(f"node.base.{node_id}")
-        self._logger.info(f"Initializing base node {node_id} at layer {layer} on port {port}")
+        self._logger.info("Initializing base node %s at layer %s on port %s", node_id, layer, port)
         self.websocket_client = NodeWebSocketClient(node_id, layer)
         self.websocket_client._get_current_data = self._get_websocket_data
         self.websocket_client._get_operation_log = self._get_websocket_operation_log
 
     async def _get_websocket_data(self) -> Dict[str, Any]:
-        """Get current data for WebSocket monitoring."""
+        """Get current data for WebSocket monitoring.
+
+        The mapping is kept between calls and only the keys changed since
+        the previous call are updated, so the cost follows the delta
+        rather than the size of the store.
+        """
         try:
-            data = await self.store.get_all()
-            return {str(item.key): str(item.value) for item in data}
+            changes = self.store.get_changes_since(self._websocket_data_sequence)
+            for sequence, item in changes:
+                self._websocket_data[str(item.key)] = str(item.value)
+                self._websocket_data_sequence = sequence
+            return self._websocket_data
         except Exception as e:
-            self._logger.error(f"Error getting WebSocket data: {e}")
+            self._logger.error("Error getting WebSocket data: %s", e)
             return {}
 
     async def _get_websocket_operation_log(self) -> list:
@@ -60,17 +77,17 @@ class BaseNode(replication_pb2_grpc.NodeServiceServicer):
         try:
             return await self.store.get_operation_log()
         except Exception as e:
-            self._logger.error(f"Error getting operation log: {e}")
+            self._logger.error("Error getting operation log: %s", e)
             return []
 
     async def start(self):
         """Start the node's gRPC server and replication strategy."""
-        self._logger.info(f"Starting base node {self.node_id}")
+        self._logger.info("Starting base node %s", self.node_id)
         try:
-            self.server = grpc.aio.server()
+            self.server = grpc.aio.server(options=SERVER_OPTIONS)
             replication_pb2_grpc.add_NodeServiceServicer_to_server(self, self.server)
             listen_addr = f'[::]:{self.port}'
-            self._logger.debug(f"Adding insecure port {listen_addr}")
+            self._logger.debug("Adding insecure port %s", listen_addr)
             self.server.add_insecure_port(listen_addr)
             self._logger.debug("Starting gRPC server")
             await self.server.start()
@@ -79,10 +96,10 @@ class BaseNode(replication_pb2_grpc.NodeServiceServicer):
             self._logger.debug("Starting WebSocket client")
             await self.websocket_client.start()
             self._ready.set()
-            self._logger.info(f"Base node {self.node_id} started successfully")
+            self._logger.info("Base node %s started successfully", self.node_id)
             return self
         except Exception as e:
-            self._logger.error(f"Failed to start node: {e}")
+            self._logger.error("Failed to start node: %s", e)
             raise
 
     async def wait_for_ready(self, timeout: float = 5.0):
@@ -96,15 +113,15 @@ class BaseNode(replication_pb2_grpc.NodeServiceServicer):
         """
         try:
             await asyncio.wait_for(self._ready.wait(), timeout)
-            self._logger.debug(f"Node {self.node_id} is ready")
+            self._logger.debug("Node %s is ready", self.node_id)
             return True
         except asyncio.TimeoutError:
-            self._logger.error(f"Timeout waiting for node {self.node_id} to be ready")
+            self._logger.error("Timeout waiting for node %s to be ready", self.node_id)
             return False
 
     async def stop(self):
         """Stop the node's gRPC server and cleanup resources."""
-        self._logger.info(f"Stopping base node {self.node_id}")
+        self._logger.info("Stopping base node %s", self.node_id)
         try:
             if hasattr(self, 'websocket_client'):
                 self._logger.debug("Stopping WebSocket client")
@@ -120,9 +137,9 @@ class BaseNode(replication_pb2_grpc.NodeServiceServicer):
                 await self.replication.stop()
             self._ready.clear()
             self._closed = True
-            self._logger.info(f"Base node {self.node_id} stopped successfully")
+            self._logger.info("Base node %s stopped successfully", self.node_id)
         except Exception as e:
-            self._logger.error(f"Error during node shutdown: {e}")
+            self._logger.error("Error during node shutdown: %s", e)
             raise
 
     async def GetNodeStatus(self, request: replication_pb2.Empty, context: grpc.aio.ServicerContext) -> replication_pb2.NodeStatus:
@@ -140,18 +157,41 @@ class BaseNode(replication_pb2_grpc.NodeServiceServicer):
         """
         self._logger.debug("Getting node status")
         try:
-            current_data = await self.store.get_all()
-            self._logger.debug(f"Retrieved {len(current_data)} data items")
-            status = replication_pb2.NodeStatus(
-                node_id=self.node_id,
-                layer=self.layer,
-                current_data=current_data
-            )
+            if self._status_cache_sequence != self.store.change_sequence:
+                status = replication_pb2.NodeStatus()
+                status.CopyFrom(self._status_template)
+                status.current_data.extend(self.store.items())
+                self._status_cache = status
+                self._status_cache_sequence = self.store.change_sequence
+                self._logger.debug("Retrieved %s data items", len(status.current_data))
+            status = self._status_cache
+            status.update_count = self.websocket_client.update_count
             return status
         except Exception as e:
-            self._logger.error(f"Failed to get node status: {e}", exc_info=True)
+            self._logger.error("Failed to get node status: %s", e, exc_info=True)
             raise
 
+    async def SyncUpdatesStream(self, request_iterator, context: grpc.aio.ServicerContext):
+        """Handle a long-lived stream of update groups from the previous layer.
+
+        Each group is handled by SyncUpdates in arrival order and answered
+        with one AckResponse on the response stream.
+        """
+        async for request in request_iterator:
+            yield await self.SyncUpdates(request, context)
+
+    async def _abort(self, context, code: grpc.StatusCode, message: str) -> None:
+        """Fail the current call with a status code.
+
+        In-process callers pass no context, so they get a plain exception.
+
+        Raises:
+            Exception: If context is None
+        """
+        if context is None:
+            raise Exception(message)
+        await context.abort(code, message)
+
     async def ExecuteTransaction(
         self,
         request: replication_pb2.Transaction,
@@ -0,0 +1,141 @@
+"""Helpers shared by the nodes for managing their gRPC channels."""
+import asyncio
+import itertools
+import random
+from typing import Optional
+
+import grpc
+from src.proto import replication_pb2_grpc
+
+MAX_MESSAGE_LENGTH = 64 * 1024 * 1024
+
+# Options for every channel a node opens to another node.
+CHANNEL_OPTIONS = [
+    # gRPC already reconnects failed channels with jittered exponential
+    # backoff; start it at 100ms instead of 1s and cap it at 30s instead of 120s.
+    ('grpc.initial_reconnect_backoff_ms', 100),
+    ('grpc.max_reconnect_backoff_ms', 30000),
+    # Ping idle connections so they are not silently dropped between bursts
+    ('grpc.keepalive_time_ms', 10000),
+    ('grpc.keepalive_timeout_ms', 5000),
+    # Keep pinging while no call is open, as between second layer syncs
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.max_pings_without_data', 0),
+    # Full-store syncs can exceed the default 4MB limit
+    ('grpc.max_send_message_length', MAX_MESSAGE_LENGTH),
+    ('grpc.max_receive_message_length', MAX_MESSAGE_LENGTH),
+    # Failures are handled by the nodes themselves
+    ('grpc.enable_retries', 0),
+]
+
+# Options for the node servers, matching what CHANNEL_OPTIONS sends them.
+SERVER_OPTIONS = [
+    # Accept the client keepalive pings instead of answering with GOAWAY
+    ('grpc.http2.min_ping_interval_without_data_ms', 5000),
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.max_send_message_length', MAX_MESSAGE_LENGTH),
+    ('grpc.max_receive_message_length', MAX_MESSAGE_LENGTH),
+]
+
+# Payloads at least this large are sent gzip-compressed
+COMPRESSION_THRESHOLD = 4096
+
+
+def compression_for(payload_size: int) -> Optional[grpc.Compression]:
+    """Return the compression to send a payload of payload_size bytes with.
+
+    Small payloads are sent as they are, since compressing them costs more
+    CPU than the bytes it saves on the wire.
+    """
+    if payload_size >= COMPRESSION_THRESHOLD:
+        return grpc.Compression.Gzip
+    return None
+
+
+def backoff_delay(attempt: int, initial: float = 0.1, maximum: float = 30.0) -> float:
+    """Return how long to wait before retrying after a failed attempt.
+
+    The delay doubles with every attempt up to maximum, plus up to as much
+    again of random jitter so nodes retrying together spread out.
+
+    Args:
+        attempt: Number of the failed attempt, starting at 0
+        initial: Delay after the first failure, in seconds
+        maximum: Upper bound on the delay before jitter, in seconds
+    """
+    delay = min(initial * (2 ** attempt), maximum)
+    return delay + random.uniform(0, delay)
+
+
+class ChannelPool:
+    """A few independent channels to one node, used round-robin.
+
+    A single channel multiplexes every RPC over one HTTP/2 connection.
+    Each pooled channel uses its own subchannel pool, so it opens its own
+    connection and fan-out spreads over all of them.
+
+    Attributes:
+        address: Address of the node the channels are opened against
+    """
+
+    def __init__(self, address: str, size: int = 4):
+        """Open the pool's channels.
+
+        Args:
+            address: Address of the node
+            size: Number of channels to open
+        """
+        self.address = address
+        self._channels = [
+            grpc.aio.insecure_channel(address, options=CHANNEL_OPTIONS + [
+                ('grpc.use_local_subchannel_pool', 1),
+                ('grpc.channel_pool_index', i),
+            ])
+            for i in range(size)
+        ]
+        self._stubs = itertools.cycle(
+            [replication_pb2_grpc.NodeServiceStub(channel) for channel in self._channels]
+        )
+        self._next_channel = itertools.cycle(self._channels)
+
+    def stub(self) -> replication_pb2_grpc.NodeServiceStub:
+        """Return the stub for the next channel in the pool."""
+        return next(self._stubs)
+
+    def channel(self) -> grpc.aio.Channel:
+        """Return the next channel in the pool.
+
+        Used to bind methods that take requests the caller serialized
+        itself, which the generated stubs cannot do.
+        """
+        return next(self._next_channel)
+
+    async def wait_ready(self, timeout: Optional[float] = 5.0) -> None:
+        """Wait until every channel in the pool has connected.
+
+        Args:
+            timeout: Longest wait in seconds, or None to wait indefinitely
+
+        Raises:
+            asyncio.TimeoutError: If a channel is not ready within timeout
+        """
+        await asyncio.wait_for(
+            asyncio.gather(*(channel.channel_ready() for channel in self._channels)),
+            timeout
+        )
+
+    async def wait_for_disconnect(self) -> None:
+        """Wait until any channel in the pool is no longer connected."""
+        waits = [
+            asyncio.ensure_future(channel.wait_for_state_change(grpc.ChannelConnectivity.READY))
+            for channel in self._channels
+        ]
+        try:
+            await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for wait in waits:
+                wait.cancel()
+
+    async def close(self) -> None:
+        """Close every channel in the pool concurrently."""
+        await asyncio.gather(*(channel.close() for channel in self._channels), return_exceptions=True)
@@ -2,11 +2,15 @@
 import asyncio
 import logging
 import grpc
-from typing import Dict, List, Optional
-from src.proto import replication_pb2, replication_pb2_grpc
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+from src.proto import replication_pb2
 from src.node.base_node import BaseNode
+from src.node.channels import CHANNEL_OPTIONS, ChannelPool, backoff_delay, compression_for
+from src.node.peer_stream import PeerStream
 from src.replication.eager_replication import EagerReplication
-import time
+
+_UPDATE = replication_pb2.Transaction.UPDATE
 
 class CoreNode(BaseNode):
     def __init__(
@@ -16,186 +20,306 @@ class CoreNode(BaseNode):
         port: int,
         peer_addresses: List[str],
         is_first_node: bool = False,
-        first_layer_address: Optional[str] = None
+        first_layer_address: Optional[str] = None,
+        require_all_acks: bool = True
     ):
-        super().__init__(node_id, 0, log_dir, port, EagerReplication())
-        self.replication.attach_node(self)
-        self.peer_addresses = peer_addresses
-        self.peer_stubs: Dict[str, replication_pb2_grpc.NodeServiceStub] = {}
+        super().__init__(node_id, 0, log_dir, port, EagerReplication(require_all_acks))
+        # A node listed among its own peers would replicate to itself
+        self._self_addr = f'localhost:{port}'
+        self.peer_addresses = tuple(addr for addr in peer_addresses if addr != self._self_addr)
+        self.peer_streams: Dict[str, PeerStream] = {}
+        # (address, bound send) pairs, so replication skips the lookups per update
+        self.peer_senders: Tuple[Tuple[str, Callable], ...] = ()
+        self._peer_channels: Dict[str, grpc.aio.Channel] = {}
         self.is_first_node = is_first_node
         self.first_layer_address = first_layer_address
-        self.first_layer_stub = None
+        self.first_layer_pool: Optional[ChannelPool] = None
+        self._first_layer_ready = asyncio.Event()
+        self._first_layer_task = None
+        self._first_layer_sender_task = None
+        self._first_layer_wakeup = asyncio.Event()
+        # Latest version of each key the first layer has not acknowledged yet
+        self._first_layer_pending: Dict[int, replication_pb2.DataItem] = {}
+        self._notify_timeout = 5.0
         self._update_counter = 0
+        self._key_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
         self._logger = logging.getLogger(f"node.core.{node_id}")
-        self._logger.info(f"Initializing core node {node_id} with peers: {peer_addresses}")
+        self._logger.info("Initializing core node %s with peers: %s", node_id, peer_addresses)
         if is_first_node:
-            self._logger.info(f"Node {node_id} is designated as first node with first layer at {first_layer_address}")
+            self._logger.info("Node %s is designated as first node with first layer at %s", node_id, first_layer_address)
 
     async def start(self):
-        self._logger.info(f"Starting core node {self.node_id}")
+        self._logger.info("Starting core node %s", self.node_id)
         await super().start()
 
         for addr in self.peer_addresses:
-            self._logger.debug(f"Attempting to connect to peer at {addr}")
+            self._logger.debug("Attempting to connect to peer at %s", addr)
             await self._connect_to_peer(addr)
 
         if self.is_first_node and self.first_layer_address:
-            max_retries = 5
-            retry_delay = 1.0
-            for i in range(max_retries):
-                self._logger.debug(f"Attempting to connect to first layer at {self.first_layer_address} (attempt {i+1}/{max_retries})")
-                await self._connect_to_first_layer()
-                if self.first_layer_stub:
-                    break
-                if i < max_retries - 1:
-                    self._logger.debug(f"Retrying in {retry_delay} seconds...")
-                    await asyncio.sleep(retry_delay)
-
-            if not self.first_layer_stub:
-                self._logger.error("Failed to establish connection with first layer after all retries")
-
-        self._logger.info(f"Core node {self.node_id} started successfully")
+            self._first_layer_task = asyncio.create_task(self._maintain_first_layer())
+            self._first_layer_sender_task = asyncio.create_task(self._first_layer_sender())
+            try:
+                await asyncio.wait_for(self._first_layer_ready.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                self._logger.error("First layer not reachable yet, will keep retrying in the background")
+
+        self._logger.info("Core node %s started successfully", self.node_id)
+
+    async def stop(self):
+        self._logger.info("Stopping core node %s", self.node_id)
+        for task in (self._first_layer_sender_task, self._first_layer_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        await asyncio.gather(*(stream.close() for stream in self.peer_streams.values()), return_exceptions=True)
+        await asyncio.gather(*(channel.close() for channel in self._peer_channels.values()), return_exceptions=True)
+        await super().stop()
 
     async def _connect_to_peer(self, address: str) -> None:
         try:
-            self._logger.debug(f"Creating channel to peer at {address}")
-            channel = grpc.aio.insecure_channel(address)
-            self.peer_stubs[address] = replication_pb2_grpc.NodeServiceStub(channel)
-            self._logger.info(f"Connected to peer at {address}")
+            self._logger.debug("Creating channel to peer at %s", address)
+            channel = grpc.aio.insecure_channel(address, options=CHANNEL_OPTIONS)
+            self._peer_channels[address] = channel
+            # Bound without a request serializer: replication serializes each
+            # update once and writes the same bytes to every peer.
+            propagate_stream = channel.stream_stream(
+                '/replication.NodeService/PropagateUpdateStream',
+                request_serializer=None,
+                response_deserializer=replication_pb2.AckResponse.FromString
+            )
+            stream = PeerStream(address, propagate_stream)
+            self.peer_streams[address] = stream
+            self.peer_senders += ((address, stream.send),)
+            self._logger.info("Connected to peer at %s", address)
         except Exception as e:
-            self._logger.error(f"Failed to connect to peer {address}: {e}", exc_info=True)
+            self._logger.error("Failed to connect to peer %s: %s", address, e, exc_info=True)
 
-    async def _connect_to_first_layer(self) -> None:
-        try:
-            self._logger.debug(f"Creating channel to first layer at {self.first_layer_address}")
-            channel = grpc.aio.insecure_channel(self.first_layer_address)
-            stub = replication_pb2_grpc.NodeServiceStub(channel)
-            empty = replication_pb2.Empty()
-            await stub.GetNodeStatus(empty)
-            self.first_layer_stub = stub
-            self._logger.info(f"Connected to first layer at {self.first_layer_address}")
-        except Exception as e:
-            self._logger.error(f"Failed to connect to first layer: {e}", exc_info=True)
-            self.first_layer_stub = None
+    async def _maintain_first_layer(self) -> None:
+        """Keep the channels to the first layer connected.
 
-    async def _notify_first_layer(self) -> None:
-        """Notify first layer of accumulated updates."""
+        Readiness is tracked through connectivity state changes instead of
+        probing with an RPC. While the first layer is unreachable the
+        channels keep reconnecting with gRPC's exponential backoff. Calls
+        are spread over a pool of channels, so forwarded reads and
+        notifications do not all queue on one connection.
+        """
+        self._logger.debug("Creating channel pool to first layer at %s", self.first_layer_address)
+        pool = ChannelPool(self.first_layer_address)
         try:
-            self._logger.debug("Preparing updates for first layer notification")
-            updates = self.store.get_recent_updates(10)
-            self._logger.debug(f"Got {len(updates)} recent updates to propagate")
-
-            notification = replication_pb2.UpdateGroup(
-                updates=updates,
-                source_node=self.node_id,
-                layer=0,
-                update_count=self._update_counter
-            )
+            while not self._closed:
+                await pool.wait_ready(timeout=None)
+                self.first_layer_pool = pool
+                self._first_layer_ready.set()
+                self._logger.info("Connected to first layer at %s", self.first_layer_address)
 
-            if self.first_layer_stub:
-                self._logger.debug(f"Sending {len(updates)} updates to first layer")
-                try:
-                    response = await self.first_layer_stub.SyncUpdates(notification)
-                    if response.success:
-                        self._logger.info(f"Successfully notified first layer with {len(updates)} updates")
-                    else:
-                        self._logger.error(f"First layer rejected updates: {response.message}")
-                except grpc.aio.AioRpcError as e:
-                    self._logger.error(f"gRPC error while notifying first layer: {e.code()}: {e.details()}")
-                    await self._connect_to_first_layer()
-            else:
-                self._logger.warning("No first layer connection available for notification")
-                await self._connect_to_first_layer()
+                await pool.wait_for_disconnect()
+                self.first_layer_pool = None
+                self._first_layer_ready.clear()
+                self._logger.warning("Lost connection to first layer at %s", self.first_layer_address)
+        finally:
+            self.first_layer_pool = None
+            self._first_layer_ready.clear()
+            await pool.close()
+
+    def _record_update(self, data_item: replication_pb2.DataItem) -> None:
+        """Remember an applied update until the first layer acknowledges it.
+
+        Only the node that notifies the first layer keeps them, and only the
+        latest version of each key, so they are bounded by the key space.
+        Local writes and updates propagated from peers both count towards
+        the notification threshold.
+        """
+        if not self.is_first_node:
+            return
+        current = self._first_layer_pending.get(data_item.key)
+        if current is None or data_item.version > current.version:
+            self._first_layer_pending[data_item.key] = data_item
+        self._update_counter += 1
+
+    def _maybe_notify_first_layer(self) -> None:
+        """Wake the first layer sender once enough updates were recorded."""
+        if self._update_counter >= 10:
+            self._logger.info("Update threshold reached (%s updates), notifying first layer", self._update_counter)
+            self._update_counter = 0
+            self._first_layer_wakeup.set()
+
+    async def _first_layer_sender(self) -> None:
+        """Deliver recorded updates to the first layer, off the transaction path.
+
+        Each round sends every key still pending. Keys leave the pending
+        set only once the first layer acknowledged them, and only if no
+        newer version was recorded meanwhile. A failed round is retried
+        with backoff, merged with whatever was recorded since.
+        """
+        attempt = 0
+        while True:
+            try:
+                await self._first_layer_wakeup.wait()
+                self._first_layer_wakeup.clear()
+                while self._first_layer_pending:
+                    batch = dict(self._first_layer_pending)
+                    if await self._send_first_layer_notification(list(batch.values())):
+                        pending = self._first_layer_pending
+                        for key, item in batch.items():
+                            if pending.get(key) is item:
+                                del pending[key]
+                        attempt = 0
+                        break
+                    await asyncio.sleep(backoff_delay(attempt))
+                    attempt = min(attempt + 1, 10)
+            except asyncio.CancelledError:
+                break
+
+    async def _send_first_layer_notification(self, updates: List[replication_pb2.DataItem]) -> bool:
+        """Send one batch of updates to the first layer.
+
+        Returns:
+            Whether the first layer acknowledged the batch
+        """
+        pool = self.first_layer_pool
+        if pool is None:
+            self._logger.warning("No first layer connection available for notification")
+            return False
 
+        notification = replication_pb2.UpdateGroup(
+            updates=updates,
+            source_node=self.node_id,
+            layer=0,
+            update_count=len(updates)
+        )
+        self._logger.debug("Sending %s updates to first layer", len(updates))
+        try:
+            response = await pool.stub().SyncUpdates(
+                notification,
+                timeout=self._notify_timeout,
+                compression=compression_for(notification.ByteSize())
+            )
+        except grpc.aio.AioRpcError as e:
+            self._logger.error("gRPC error while notifying first layer: %s: %s", e.code(), e.details())
+            return False
         except Exception as e:
-            self._logger.error(f"Failed to notify first layer: {e}", exc_info=True)
-            await self._connect_to_first_layer()
+            self._logger.error("Failed to notify first layer: %s", e, exc_info=True)
+            return False
+
+        if not response.success:
+            self._logger.error("First layer rejected updates: %s", response.message)
+            return False
+        self._logger.info("Successfully notified first layer with %s updates", len(updates))
+        return True
 
     async def ExecuteTransaction(
         self,
         request: replication_pb2.Transaction,
         context: grpc.aio.ServicerContext
     ) -> replication_pb2.TransactionResponse:
-        tx_type = "UPDATE" if request.type == replication_pb2.Transaction.UPDATE else "READ_ONLY"
-        self._logger.info(f"Executing {tx_type} transaction with {len(request.operations)} operations")
+        is_update = request.type == _UPDATE
+        tx_type = "UPDATE" if is_update else "READ_ONLY"
+        self._logger.info("Executing %s transaction with %s operations", tx_type, len(request.operations))
 
         try:
-            if request.type == replication_pb2.Transaction.UPDATE:
+            if is_update:
                 return await self._execute_update_transaction(request)
             return await self._execute_read_transaction(request)
         except Exception as e:
-            self._logger.error(f"Transaction failed: {e}", exc_info=True)
+            self._logger.error("Transaction failed: %s", e, exc_info=True)
             raise
 
     async def _execute_update_transaction(
         self,
         request: replication_pb2.Transaction
     ) -> replication_pb2.TransactionResponse:
-        """Execute an update transaction."""
+        """Execute an update transaction.
+
+        Only the keys written by the transaction are locked, so transactions
+        touching disjoint keys run concurrently. Locks are taken in key order
+        to avoid deadlocks and held until the writes are replicated, which
+        keeps peers from seeing two transactions' updates to a key reordered.
+
+        Writes are applied locally in operation order so later reads in the
+        same transaction see them. Replication is then pipelined: updates to
+        different keys are propagated concurrently, while updates to the same
+        key keep their relative order.
+        """
         results = []
+        updates_by_key: Dict[int, List[replication_pb2.UpdateNotification]] = {}
+        # The oneof is resolved once per operation and reused below
+        operations = [(op.WhichOneof('operation'), op) for op in request.operations]
+        write_keys = sorted({op.write.key for kind, op in operations if kind == 'write'})
         try:
-            for op in request.operations:
-                if op.HasField('write'):
-                    data_item = replication_pb2.DataItem(
-                        key=op.write.key,
-                        value=op.write.value,
-                        version=self.store.get_next_version(),
-                        timestamp=int(time.time())
-                    )
-
-                    await self.store.update(
-                        key=data_item.key,
-                        value=data_item.value,
-                        version=data_item.version
-                    )
-
-                    update_notification = replication_pb2.UpdateNotification(
-                        data=data_item,
-                        source_node=self.node_id
-                    )
-
-                    await self.replication.handle_update(update_notification)
-                    results.append(data_item)
-
-                    self._update_counter += 1
-                    self._logger.debug(f"Update counter incremented to {self._update_counter}")
-
-                    if self._update_counter >= 10 and self.is_first_node and self.first_layer_stub:
-                        self._logger.info(f"Update threshold reached ({self._update_counter} updates), notifying first layer")
-                        await self._notify_first_layer()
-                        self._update_counter = 0
-                        self._logger.debug("Update counter reset after first layer notification")
-
-                elif op.HasField('read'):
-                    item = await self.store.get(op.read.key)
-                    if item:
-                        results.append(item)
+            # asyncio.Lock.acquire returns without suspending when the lock
+            # is free, so uncontended keys cost no trip through the loop.
+            held = []
+            try:
+                for key in write_keys:
+                    lock = self._key_locks[key]
+                    await lock.acquire()
+                    held.append(lock)
+
+                for kind, op in operations:
+                    if kind == 'write':
+                        data_item = await self.store.write_next(op.write.key, op.write.value)
+                        self._record_update(data_item)
+
+                        update_notification = replication_pb2.UpdateNotification(
+                            data=data_item,
+                            source_node=self.node_id
+                        )
+                        updates_by_key.setdefault(data_item.key, []).append(update_notification)
+                        results.append(data_item)
+
+                    elif kind == 'read':
+                        item = await self.store.get(op.read.key)
+                        if item:
+                            results.append(item)
+
+                if len(updates_by_key) == 1:
+                    # Single-key transactions skip the gather and its tasks
+                    await self._replicate_in_order(next(iter(updates_by_key.values())))
+                elif updates_by_key:
+                    await asyncio.gather(*(
+                        self._replicate_in_order(updates)
+                        for updates in updates_by_key.values()
+                    ))
+            finally:
+                for lock in held:
+                    lock.release()
+
+            self._maybe_notify_first_layer()
 
             return replication_pb2.TransactionResponse(
                 success=True,
                 results=results
             )
         except Exception as e:
-            self._logger.error(f"Update transaction failed: {e}", exc_info=True)
+            self._logger.error("Update transaction failed: %s", e, exc_info=True)
             raise
 
+    async def _replicate_in_order(self, updates: List[replication_pb2.UpdateNotification]) -> None:
+        """Replicate a sequence of updates to the same key one after another."""
+        for update_notification in updates:
+            await self.replication.handle_update(update_notification)
+
     async def _execute_read_transaction(
         self,
         transaction: replication_pb2.Transaction
     ) -> replication_pb2.TransactionResponse:
         """Execute a read-only transaction."""
-        self._logger.info(f"Processing read transaction with {len(transaction.operations)} operations for layer {transaction.target_layer}")
+        self._logger.info("Processing read transaction with %s operations for layer %s", len(transaction.operations), transaction.target_layer)
 
         if transaction.target_layer > 0:
-            self._logger.info(f"Forwarding read transaction to layer {transaction.target_layer}")
-            if transaction.target_layer == 1 and self.is_first_node and self.first_layer_stub:
+            self._logger.info("Forwarding read transaction to layer %s", transaction.target_layer)
+            if transaction.target_layer == 1 and self.is_first_node and self.first_layer_pool:
                 try:
                     self._logger.info("Forwarding read transaction to first layer")
-                    response = await self.first_layer_stub.ExecuteTransaction(transaction)
+                    response = await self.first_layer_pool.stub().ExecuteTransaction(transaction)
                     if response.success:
-                        self._logger.info(f"Successfully read from layer 1: {[r.value for r in response.results]}")
+                        self._logger.info("Successfully read %s items from layer 1", len(response.results))
                     else:
-                        self._logger.error(f"Failed to read from layer 1: {response.error_message}")
+                        self._logger.error("Failed to read from layer 1: %s", response.error_message)
                         raise Exception(response.error_message)
                     return response
                 except Exception as e:
@@ -208,23 +332,22 @@ class CoreNode(BaseNode):
                 raise Exception(error_msg)
 
         self._logger.info("Executing read transaction in core layer")
-        results = []
+        response = replication_pb2.TransactionResponse(success=True)
+        results = response.results
         try:
-            for i, op in enumerate(transaction.operations):
-                if op.HasField('read'):
-                    self._logger.info(f"Reading key {op.read.key} from core layer")
-                    item = await self.store.get(op.read.key)
-                    if item:
-                        self._logger.info(f"Found value {item.value} for key {op.read.key} (version {item.version})")
-                        results.append(item)
-                    else:
-                        self._logger.warning(f"No value found for key {op.read.key} in core layer")
+            keys = [op.read.key for op in transaction.operations if op.WhichOneof('operation') == 'read']
+            items = await self.store.get_many(keys)
+            for key in keys:
+                self._logger.debug("Reading key %s from core layer", key)
+                item = items[key]
+                if item:
+                    self._logger.debug("Found value %s for key %s (version %s)", item.value, key, item.version)
+                    results.append(item)
+                else:
+                    self._logger.debug("No value found for key %s in core layer", key)
 
-            self._logger.info(f"Successfully completed read transaction with {len(results)} results from core layer")
-            return replication_pb2.TransactionResponse(
-                success=True,
-                results=results
-            )
+            self._logger.info("Successfully completed read transaction with %s results from core layer", len(results))
+            return response
 
         except Exception as e:
             error_msg = f"Read transaction failed in core layer: {e}"
@@ -233,13 +356,22 @@ class CoreNode(BaseNode):
 
     async def PropagateUpdate(self, request: replication_pb2.UpdateNotification, context: grpc.aio.ServicerContext) -> replication_pb2.AckResponse:
         """Handle update propagation from peer nodes."""
-        self._logger.info(f"Received update propagation from {request.source_node} for key={request.data.key}")
+        self._logger.debug("Received update propagation from %s for key=%s", request.source_node, request.data.key)
 
         try:
             self._logger.debug("Delegating to replication strategy")
-            await self.replication.PropagateUpdate(request, context)
-            return replication_pb2.AckResponse(success=True)
+            # A NACK for a failed store write must reach the sender
+            return await self.replication.PropagateUpdate(request, context)
         except Exception as e:
             error_msg = f"Failed to handle propagated update: {e}"
             self._logger.error(error_msg, exc_info=True)
-            return replication_pb2.AckResponse(success=False, message=error_msg)
\ No newline at end of file
+            return replication_pb2.AckResponse(success=False, message=error_msg)
+
+    async def PropagateUpdateStream(self, request_iterator, context: grpc.aio.ServicerContext):
+        """Handle a long-lived stream of update propagations from a peer node.
+
+        Each update is applied in arrival order and answered with one
+        AckResponse on the response stream.
+        """
+        async for request in request_iterator:
+            yield await self.PropagateUpdate(request, context)
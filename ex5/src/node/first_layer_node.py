@@ -2,19 +2,48 @@
 import asyncio
 import logging
 import grpc
-from typing import Optional, List
-from src.proto import replication_pb2, replication_pb2_grpc
+from collections import OrderedDict
+from typing import Dict, Optional, List, Tuple
+from src.proto import replication_pb2
 from src.node.base_node import BaseNode
+from src.node.channels import ChannelPool, backoff_delay
+from src.node.peer_stream import PeerStream
+from src.node.sync_schedule import SyncSchedule
 from src.replication.passive_replication import PassiveReplication
+from src.storage.data_store import latest_per_key
 import time
 
+_UPDATE = replication_pb2.Transaction.UPDATE
+
+# Successful ACKs carry no per-request state, so one instance is shared
+_ACK_OK = replication_pb2.AckResponse(success=True)
+
 class FirstLayerNode(BaseNode):
+    # Longest wait between syncs to the second layer, in seconds
+    _sync_interval: float = 10.0
+    # Waiting updates that make the sync loop run at once
+    _sync_threshold: int = 10
+    # Most updates sent to the second layer in one UpdateGroup
+    _max_batch: int = 50
+    # Deltas at least this large are encoded in a worker thread
+    _offload_threshold: int = 1000
+    # Deltas are resent in full this often, in case the second layer
+    # ever missed one
+    _full_sync_interval: float = 3600.0
+    # Most read responses kept in the read cache
+    _read_cache_size: int = 4096
+    # How long the replication worker waits for more updates to arrive
+    # before sending a round to the backups, in seconds
+    _coalesce_window: float = 0.001
+    # Most updates the replication worker takes into one round
+    _max_replication_batch: int = 256
+
     def __init__(
         self,
         node_id: str,
         port: int,
         is_primary: bool = False,
-        backup_addresses: List[str] = None,
+        backup_addresses: Optional[List[str]] = None,
         second_layer_address: Optional[str] = None
     ):
         log_dir = f"logs/{node_id.lower()}"
@@ -31,235 +60,420 @@ class FirstLayerNode(BaseNode):
         self.is_primary = is_primary
         self.backup_addresses = backup_addresses or []
         self.second_layer_address = second_layer_address
-        self.backup_stubs = {}
-        self.second_layer_stub = None
+        self.backup_pools: Dict[str, ChannelPool] = {}
+        self.second_layer_pool: Optional[ChannelPool] = None
+        self.second_layer_stream: Optional[PeerStream] = None
+        # Serialized groups waiting for _downstream_pump to deliver them
+        self._downstream_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
+        self._downstream_task: Optional[asyncio.Task] = None
         self._logger = logging.getLogger(f"node.first_layer.{node_id}")
-        self._last_sync_time = time.time()
-        self._sync_interval = 10.0
-        self._sync_task = None
-        self._pending_updates = []
-        self._logger.info(f"Initializing first layer node {node_id} (primary={is_primary})")
+        self._last_sync_time: float = time.monotonic()
+        self._sync_task: Optional[asyncio.Task] = None
+        # Updates stored on the primary and waiting to reach the backups
+        self._replication_queue: asyncio.Queue = asyncio.Queue()
+        self._replication_task: Optional[asyncio.Task] = None
+        # Set while the backups have fallen behind the primary
+        self.backups_degraded: bool = False
+        # Sync sooner than every _sync_interval when updates arrive often,
+        # and at once when _sync_threshold updates are waiting to be sent
+        self._sync_schedule = SyncSchedule(max_interval=self._sync_interval)
+        self._sync_wakeup = asyncio.Event()
+        # Only one notification to the second layer is built and sent at a time
+        self._notify_lock = asyncio.Lock()
+        # Store change sequence already handed to _downstream_pump, which
+        # retries until the second layer holds it; while the store is still
+        # at it, sync ticks have nothing to send
+        self._last_synced_sequence: int = 0
+        self._last_full_sync_time: float = time.monotonic()
+        # Read responses by the keys they read, dropped whenever the store
+        # changes and evicted oldest first beyond _read_cache_size
+        self._read_cache: 'OrderedDict[Tuple[int, ...], replication_pb2.TransactionResponse]' = OrderedDict()
+        self._read_cache_sequence: int = -1
+        self._logger.info("Initializing first layer node %s (primary=%s)", node_id, is_primary)
         if backup_addresses:
-            self._logger.info(f"Configured with backups at {', '.join(backup_addresses)}")
+            self._logger.info("Configured with backups at %s", ', '.join(backup_addresses))
         if second_layer_address:
-            self._logger.info(f"Configured with second layer at {second_layer_address}")
+            self._logger.info("Configured with second layer at %s", second_layer_address)
 
-    async def start(self):
-        self._logger.info(f"Starting first layer node {self.node_id}")
+    async def start(self) -> None:
+        self._logger.info("Starting first layer node %s", self.node_id)
         await super().start()
 
         # Connect to backup nodes regardless of primary status
         if self.backup_addresses:
-            self._logger.debug(f"Connecting to nodes at {', '.join(self.backup_addresses)}")
+            self._logger.debug("Connecting to nodes at %s", ', '.join(self.backup_addresses))
             for addr in self.backup_addresses:
-                await self._connect_to_backup(addr)
+                if addr not in self.backup_pools:
+                    self._connect_to_backup(addr)
+            self.replication.set_backup_pools(list(self.backup_pools.values()))
+
+        if self.is_primary and self.backup_pools:
+            self._replication_task = asyncio.create_task(self._replication_worker())
 
-        # Connect to second layer and start time-based sync
+        # Start time-based sync; the pump connects to the second layer
         if self.second_layer_address and self.is_primary:
-            self._logger.debug(f"Connecting to second layer at {self.second_layer_address}")
-            await self._connect_to_second_layer()
+            self._downstream_task = asyncio.create_task(self._downstream_pump())
             # Start the time-based sync loop for C layer
             self._sync_task = asyncio.create_task(self._time_sync_loop())
             self._logger.info("Started time sync loop for second layer")
 
-        self._logger.info(f"First layer node {self.node_id} started successfully")
+        self._logger.info("First layer node %s started successfully", self.node_id)
+
+    async def stop(self) -> None:
+        self._logger.info("Stopping first layer node %s", self.node_id)
+        for task in (self._sync_task, self._replication_task, self._downstream_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._sync_task = None
+        self._replication_task = None
+        self._downstream_task = None
+        if self.second_layer_stream:
+            await self.second_layer_stream.close()
+        pools = list(self.backup_pools.values())
+        if self.second_layer_pool:
+            pools.append(self.second_layer_pool)
+        await asyncio.gather(*(pool.close() for pool in pools), return_exceptions=True)
+        await super().stop()
 
     async def ExecuteTransaction(
         self,
         request: replication_pb2.Transaction,
         context: grpc.aio.ServicerContext
     ) -> replication_pb2.TransactionResponse:
-        tx_type = "READ_ONLY" if request.type == replication_pb2.Transaction.READ_ONLY else "UPDATE"
-        self._logger.info(f"Received {tx_type} transaction with {len(request.operations)} operations")
+        is_update = request.type == _UPDATE
+        tx_type = "UPDATE" if is_update else "READ_ONLY"
+        self._logger.info("Received %s transaction with %s operations", tx_type, len(request.operations))
 
-        if request.type == replication_pb2.Transaction.UPDATE:
+        if is_update:
             error_msg = "Write operations not allowed"
-            self._logger.warning(f"Rejected {tx_type} transaction: {error_msg}")
-            raise Exception(error_msg)
+            self._logger.warning("Rejected %s transaction: %s", tx_type, error_msg)
+            await self._abort(context, grpc.StatusCode.INVALID_ARGUMENT, error_msg)
 
+        # One pass both rejects stray writes and collects the keys to read
+        read_keys = []
         for op in request.operations:
-            if op.HasField('write'):
+            kind = op.WhichOneof('operation')
+            if kind == 'read':
+                read_keys.append(op.read.key)
+            elif kind == 'write':
                 error_msg = "Write operations not allowed"
-                self._logger.warning(f"Rejected transaction with write operation: {error_msg}")
-                raise Exception(error_msg)
-
-        results = []
+                self._logger.warning("Rejected transaction with write operation: %s", error_msg)
+                await self._abort(context, grpc.StatusCode.INVALID_ARGUMENT, error_msg)
+        keys = tuple(read_keys)
+        if self._read_cache_sequence != self.store.change_sequence:
+            self._read_cache.clear()
+            self._read_cache_sequence = self.store.change_sequence
+        cached = self._read_cache.get(keys)
+        if cached is not None:
+            self._logger.debug("Answered read of %s keys from cache", len(keys))
+            return cached
+
+        response = replication_pb2.TransactionResponse(success=True)
+        results = response.results
         try:
-            for i, op in enumerate(request.operations):
-                if op.HasField('read'):
-                    self._logger.debug(f"Processing read operation {i+1}/{len(request.operations)}: key={op.read.key}")
-                    item = await self.store.get(op.read.key)
-                    if item:
-                        self._logger.debug(f"Found value for key={op.read.key}: version={item.version}")
-                        results.append(item)
-                    else:
-                        self._logger.debug(f"No value found for key={op.read.key}")
-
-            self._logger.info(f"Successfully completed read transaction with {len(results)} results")
-            return replication_pb2.TransactionResponse(success=True, results=results)
+            items = await self.store.get_many(keys)
         except Exception as e:
-            self._logger.error(f"Read transaction failed: {e}", exc_info=True)
-            raise
+            self._logger.error("Read transaction failed: %s", e, exc_info=True)
+            await self._abort(context, grpc.StatusCode.INTERNAL, f"Read transaction failed: {e}")
+        if self._logger.isEnabledFor(logging.DEBUG):
+            for i, key in enumerate(keys):
+                item = items[key]
+                self._logger.debug("Read operation %s/%s: key=%s, version=%s",
+                                   i + 1, len(keys), key, item.version if item else None)
+        for key in keys:
+            item = items[key]
+            if item:
+                results.append(item)
+
+        self._logger.info("Successfully completed read transaction with %s results", len(results))
+        self._read_cache[keys] = response
+        if len(self._read_cache) > self._read_cache_size:
+            self._read_cache.popitem(last=False)
+        return response
 
     async def SyncUpdates(self, request: replication_pb2.UpdateGroup, context: grpc.aio.ServicerContext) -> replication_pb2.AckResponse:
-        """Handle updates from core layer (A nodes)."""
+        """Handle updates from core layer (A nodes).
+
+        Updates are acknowledged once stored locally. The primary passes
+        them on to its backups from _replication_worker afterwards.
+        """
         source_node = request.source_node
 
         # If we're a backup node (B2), reject direct updates from A nodes
-        if not self.is_primary and source_node.startswith('A'):
+        if not self.is_primary and request.layer == 0:
             error_msg = f"Backup node cannot accept updates directly from core layer: {source_node}"
             return replication_pb2.AckResponse(success=False, message=error_msg)
 
-        self._logger.info(f"Received sync request from {source_node} with {len(request.updates)} updates")
+        self._logger.info("Received sync request from %s with %s updates", source_node, len(request.updates))
         try:
-            # Store updates locally
-            for update in request.updates:
-                await self.store.update(
-                    key=update.key,
-                    value=update.value,
-                    version=update.version
-                )
-                self._logger.debug(f"Stored update for key={update.key}")
+            # Store updates locally in one batch, skipping any older than what we hold
+            stored = await self.store.update_many(request.updates, newer_only=True)
+            if stored:
+                self._logger.debug("Stored %s updates", len(stored))
 
                 # Update monitoring stats
-                self.websocket_client.increment_update_count()
-                self.websocket_client.update_sync_time()
+                self.websocket_client.record_updates(len(stored))
 
-            # If primary, propagate immediately to backup nodes (B2)
-            if self.is_primary and self.backup_stubs:
-                self._logger.debug(f"Propagating {len(request.updates)} updates to backups")
-                success = await self.replication.handle_update(request)
-                if not success:
-                    error_msg = "Failed to propagate to backups"
-                    self._logger.error(error_msg)
-                    return replication_pb2.AckResponse(success=False, message=error_msg)
-                self._logger.info(f"Successfully propagated {len(request.updates)} updates to backups")
+                if self._sync_task:
+                    self._sync_schedule.record_arrival()
+                    if self.store.change_sequence - self._last_synced_sequence >= self._sync_threshold:
+                        self._sync_wakeup.set()
 
-            return replication_pb2.AckResponse(success=True)
+            # If primary, hand the updates to the backup (B2) worker; the
+            # core layer is answered once they are stored here
+            if self._replication_task and stored:
+                self._replication_queue.put_nowait(stored)
+
+            return _ACK_OK
 
         except Exception as e:
             error_msg = f"Failed to sync updates: {e}"
             self._logger.error(error_msg, exc_info=True)
             return replication_pb2.AckResponse(success=False, message=error_msg)
 
-    async def _connect_to_backup(self, address: str) -> None:
-        """Connect to a backup node with retries."""
-        max_retries = 5
-        retry_delay = 1.0
-
-        for attempt in range(max_retries):
-            try:
-                self._logger.debug(f"Creating channel to node at {address}")
-                channel = grpc.aio.insecure_channel(address)
-                stub = replication_pb2_grpc.NodeServiceStub(channel)
-
-                # Try to get node status
-                empty = replication_pb2.Empty()
-                await stub.GetNodeStatus(empty)
-
-                self._logger.info(f"Connected to backup at {address}")
-                self.backup_stubs[address] = stub
-                self.replication.set_backup_stubs(list(self.backup_stubs.values()))
-                return
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self._logger.debug(f"Attempt {attempt + 1} failed to connect to backup {address}: {e}")
-                    await asyncio.sleep(retry_delay)
-                else:
-                    self._logger.warning(f"Failed to connect to backup at {address} after {max_retries} attempts")
-
-    async def _connect_to_second_layer(self) -> None:
-        """Connect to second layer node with retries."""
-        max_retries = 5
-        retry_delay = 1.0
-
-        for attempt in range(max_retries):
+    async def _replication_worker(self) -> None:
+        """Propagate stored updates to the backups, off the SyncUpdates path.
+
+        Updates queued within a short window of each other go out as one
+        group, stopping once it reaches _max_replication_batch updates.
+        Every backup that does not acknowledge a round is tracked with the
+        updates it missed, and gets them again, together with each later
+        round, until it does. The node stays marked degraded and retries
+        with backoff while any backup is behind, even if a majority of the
+        layer already holds the updates.
+        """
+        pending: List[replication_pb2.DataItem] = []
+        # Updates each lagging backup is still missing, by address
+        lagging: Dict[str, List[replication_pb2.DataItem]] = {}
+        attempt = 0
+        while True:
             try:
-                self._logger.debug(f"Connecting to second layer at {self.second_layer_address}")
-                channel = grpc.aio.insecure_channel(self.second_layer_address)
-                self.second_layer_stub = replication_pb2_grpc.NodeServiceStub(channel)
-
-                # Verify connection
-                empty = replication_pb2.Empty()
-                await self.second_layer_stub.GetNodeStatus(empty)
+                queue = self._replication_queue
+                if not pending and not lagging:
+                    pending.extend(await queue.get())
+                    # Let a burst of back-to-back syncs land in this round
+                    await asyncio.sleep(self._coalesce_window)
+                while len(pending) < self._max_replication_batch and not queue.empty():
+                    pending.extend(queue.get_nowait())
+
+                # Backups that are caught up share one group; each lagging
+                # one gets what it missed merged with this round
+                targets = {
+                    address: lagging[address] + pending if address in lagging else pending
+                    for address in self.backup_pools
+                }
+                in_sync = [pool for address, pool in self.backup_pools.items() if address not in lagging]
+                rounds = [(pending, in_sync)] if pending and in_sync else []
+                rounds += [(targets[address], [self.backup_pools[address]]) for address in lagging]
+
+                self._logger.debug("Propagating %s updates to %s backups, %s behind",
+                                   len(pending), len(self.backup_pools), len(lagging))
+                results = await asyncio.gather(
+                    *(self.replication.replicate(updates, pools) for updates, pools in rounds),
+                    return_exceptions=True
+                )
+                failed = set()
+                for (_, pools), result in zip(rounds, results):
+                    if isinstance(result, Exception):
+                        self._logger.error("Failed to propagate to backups: %s", result)
+                        failed.update(pool.address for pool in pools)
+                    else:
+                        failed.update(pool.address for pool in result)
+                lagging = {address: latest_per_key(targets[address]) for address in failed}
+                pending = []
+
+                if not lagging:
+                    attempt = 0
+                    if self.backups_degraded:
+                        self._logger.info("Backups caught up with the primary again")
+                        self.backups_degraded = False
+                    continue
+
+                if not self.backups_degraded:
+                    self._logger.error("Backups %s are behind, retrying in the background", sorted(lagging))
+                    self.backups_degraded = True
+                await asyncio.sleep(backoff_delay(attempt))
+                attempt = min(attempt + 1, 10)
+            except asyncio.CancelledError:
+                break
 
-                self._logger.info(f"Connected to second layer at {self.second_layer_address}")
-                return
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self._logger.debug(f"Attempt {attempt + 1} failed to connect to second layer: {e}")
-                    await asyncio.sleep(retry_delay)
-                else:
-                    self._logger.warning(f"Failed to connect to second layer after {max_retries} attempts")
+    def _connect_to_backup(self, address: str) -> None:
+        """Open the channel pool to a backup node without waiting for it.
+
+        gRPC connects the channels in the background and keeps reconnecting
+        them, and the replication worker retries a backup that misses a
+        round, so an unreachable backup does not hold up start().
+        """
+        self._logger.debug("Creating channel pool to backup at %s", address)
+        self.backup_pools[address] = ChannelPool(address)
+
+    def _connect_to_second_layer(self) -> None:
+        """Open the channel pool and update stream to the second layer.
+
+        Nothing is waited for here: the stream is opened on the first send,
+        and _downstream_pump retries failed sends with backoff while gRPC
+        reconnects the channels.
+        """
+        self._logger.debug("Creating channel pool to second layer at %s", self.second_layer_address)
+        pool = ChannelPool(self.second_layer_address)
+        self.second_layer_pool = pool
+        # Batches go out on one long-lived stream rather than a unary call
+        # each. Bound without a request serializer, as notifications are
+        # serialized once when they are built.
+        sync_stream = pool.channel().stream_stream(
+            '/replication.NodeService/SyncUpdatesStream',
+            request_serializer=None,
+            response_deserializer=replication_pb2.AckResponse.FromString
+        )
+        self.second_layer_stream = PeerStream(self.second_layer_address, sync_stream)
 
     async def _time_sync_loop(self) -> None:
-        """Time-based sync loop for second layer propagation (every 10 seconds)."""
+        """Time-based sync loop for second layer propagation.
+
+        Each wait is taken from the sync schedule, at most _sync_interval,
+        and is cut short once _sync_threshold updates are waiting. Either
+        way the loop is the only place notifications are queued from, so a
+        threshold wake-up and the timer never both fire for one batch.
+        """
         self._logger.info("Starting time sync loop for second layer")
         while True:
             try:
-                await asyncio.sleep(self._sync_interval)
-                current_time = time.time()
-
-                if current_time - self._last_sync_time >= self._sync_interval:
-                    self._logger.info("Time sync interval reached (10s), notifying second layer")
-                    await self._notify_second_layer()
-                    self._last_sync_time = current_time
+                interval = self._sync_schedule.next_interval()
+                try:
+                    await asyncio.wait_for(self._sync_wakeup.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._sync_wakeup.clear()
+                current_time = time.monotonic()
+
+                if current_time - self._last_full_sync_time >= self._full_sync_interval:
+                    self._logger.info("Full sync interval reached, resending the whole store to second layer")
+                    self._last_synced_sequence = 0
+                    self._last_full_sync_time = current_time
+
+                if self.store.change_sequence == self._last_synced_sequence:
+                    self._logger.debug("No new updates since last sync, skipping second layer notification")
+                    continue
+                self._logger.info("Sync due after %.2fs, notifying second layer", current_time - self._last_sync_time)
+                await self._notify_second_layer()
+                self._last_sync_time = current_time
 
             except asyncio.CancelledError:
                 self._logger.info("Stopping time sync loop")
                 break
             except Exception as e:
-                self._logger.error(f"Time sync loop error: {e}", exc_info=True)
+                self._logger.error("Time sync loop error: %s", e, exc_info=True)
                 await asyncio.sleep(1)
 
     async def _notify_second_layer(self) -> None:
-        """Notify second layer of updates."""
-        try:
+        """Hand the updates not yet synced to the second layer pump.
+
+        The updates are split into groups of at most _max_batch items and
+        queued for _downstream_pump, which owns delivery from there.
+        Calls made while one is building its groups wait for it and then
+        queue only what changed after it, so the same updates are never
+        queued twice.
+        """
+        async with self._notify_lock:
+            # A call that waited on the lock may find everything already queued
+            if self.store.change_sequence == self._last_synced_sequence:
+                return
             self._logger.info("Preparing updates for second layer notification")
-            updates = await self.store.get_all()
-
-            if updates:
-                self._logger.info(f"Sending {len(updates)} updates to second layer")
-                for update in updates:
-                    self._logger.debug(f"Update: key={update.key}, value={update.value}, "
-                                     f"version={update.version}")
-
-                notification = replication_pb2.UpdateGroup(
-                    updates=updates,
-                    source_node=self.node_id,
-                    layer=1,
-                    update_count=len(updates)
+            changes = self.store.get_changes_since(self._last_synced_sequence)
+
+            self._logger.info("Sending %s updates to second layer", len(changes))
+            if self._logger.isEnabledFor(logging.DEBUG):
+                for _, update in changes:
+                    self._logger.debug("Update: key=%s, value=%s, version=%s",
+                                       update.key, update.value, update.version)
+
+            batches = [
+                changes[start:start + self._max_batch]
+                for start in range(0, len(changes), self._max_batch)
+            ]
+            if len(changes) >= self._offload_threshold:
+                # A full resync covers the whole store, and encoding it here
+                # would hold up every read served meanwhile
+                payloads = await asyncio.get_running_loop().run_in_executor(
+                    None, self._encode_batches, batches
                 )
-
-                if self.second_layer_stub:
-                    try:
-                        response = await self.second_layer_stub.SyncUpdates(notification)
-                        self._logger.info(f"Second layer response: {response.success} - {response.message}")
-                    except Exception as e:
-                        self._logger.error(f"Failed to notify second layer: {e}")
-                        await self._connect_to_second_layer()
-                else:
-                    self._logger.warning("No second layer connection available")
-                    await self._connect_to_second_layer()
-
-        except Exception as e:
-            self._logger.error(f"Failed to notify second layer: {e}", exc_info=True)
-            await self._connect_to_second_layer()
-
-    async def _periodic_sync(self):
-        """Periodically sync with second layer every 10 seconds."""
+            else:
+                payloads = self._encode_batches(batches)
+
+            size = 0
+            for batch, payload in zip(batches, payloads):
+                size += len(payload)
+                # Waits here while the pump is _downstream_queue's size behind
+                await self._downstream_queue.put(payload)
+                self._last_synced_sequence = batch[-1][0]
+            self._logger.info("Queued %s bytes for the second layer", size)
+
+    def _encode_batches(self, batches: List[List[Tuple[int, replication_pb2.DataItem]]]) -> List[bytes]:
+        """Serialize each batch of changes as an UpdateGroup for the second layer.
+
+        Safe to run outside the event loop: the store replaces items on
+        update rather than changing them, so the batches cannot change
+        underneath it.
+        """
+        return [
+            replication_pb2.UpdateGroup(
+                updates=[update for _, update in batch],
+                source_node=self.node_id,
+                layer=1,
+                update_count=len(batch)
+            ).SerializeToString()
+            for batch in batches
+        ]
+
+    async def _downstream_pump(self) -> None:
+        """Deliver queued notifications to the second layer.
+
+        Everything queued is written to the stream at once. Groups that
+        fail are kept, in order, and retried with backoff together with
+        whatever is queued meanwhile, so no update is dropped. The pump
+        owns the connection to the second layer and opens it on first use.
+        """
+        in_flight: List[bytes] = []
+        attempt = 0
         while True:
             try:
-                await asyncio.sleep(10)
-                self._logger.debug("Time sync interval reached, notifying second layer")
-                await self._notify_second_layer()
-
+                if not in_flight:
+                    in_flight.append(await self._downstream_queue.get())
+                queue = self._downstream_queue
+                while len(in_flight) < queue.maxsize and not queue.empty():
+                    in_flight.append(queue.get_nowait())
+
+                if self.second_layer_stream is None:
+                    self._connect_to_second_layer()
+                results = await asyncio.gather(
+                    *(self.second_layer_stream.send(payload) for payload in in_flight),
+                    return_exceptions=True
+                )
+                delivered = 0
+                for response in results:
+                    if isinstance(response, Exception):
+                        # The stream reopens on the next send, over a
+                        # channel gRPC keeps reconnecting by itself
+                        self._logger.error("Failed to notify second layer: %s", response)
+                        break
+                    if not response.success:
+                        self._logger.error("Second layer rejected updates: %s", response.message)
+                        break
+                    delivered += 1
+                self._logger.info("Second layer accepted %s of %s groups", delivered, len(in_flight))
+                del in_flight[:delivered]
+                if not in_flight:
+                    attempt = 0
+                    continue
+
+                await asyncio.sleep(backoff_delay(attempt))
+                attempt = min(attempt + 1, 10)
             except asyncio.CancelledError:
-                self._logger.info("Stopping periodic sync")
                 break
-            except Exception as e:
-                self._logger.error(f"Error in periodic sync: {e}", exc_info=True)
-                await asyncio.sleep(1)
 
     async def PropagateUpdate(
         self,
@@ -267,23 +481,17 @@ class FirstLayerNode(BaseNode):
         context: grpc.aio.ServicerContext
     ) -> replication_pb2.AckResponse:
         """Handle update propagation from primary node."""
-
-
         try:
-            # Store the update locally
+            # Store the update locally, unless a newer version already arrived
             data = request.data
-            await self.store.update(
-                key=data.key,
-                value=data.value,
-                version=data.version
-            )
+            if await self.store.update_if_newer(data.key, data.value, data.version) is None:
+                return _ACK_OK
 
             # Update monitoring stats
-            self.websocket_client.increment_update_count()
-            self.websocket_client.update_sync_time()
+            self.websocket_client.record_updates()
 
-            self._logger.info(f"Successfully processed update for key={data.key}")
-            return replication_pb2.AckResponse(success=True)
+            self._logger.debug("Successfully processed update for key=%s", data.key)
+            return _ACK_OK
 
         except Exception as e:
             error_msg = f"Failed to handle propagated update: {e}"
@@ -0,0 +1,123 @@
+"""Long-lived bidirectional stream for pushing updates to a peer."""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Optional
+
+import grpc
+from src.proto import replication_pb2
+
+
+class PeerStream:
+    """Keeps one open bidi stream to a peer and pairs every write with its ACK.
+
+    The server answers each request on the stream in order, so pending writes
+    are tracked as a FIFO of futures that a background reader resolves as ACKs
+    arrive. The stream is opened lazily on first use and recycled on error.
+    At most ``max_in_flight`` writes wait for an ACK at a time; further
+    senders queue on a semaphore instead of piling up on the stream.
+
+    Attributes:
+        address: Address of the peer the stream is opened against
+    """
+
+    def __init__(
+        self,
+        address: str,
+        open_stream: Callable[[], grpc.aio.StreamStreamCall],
+        max_in_flight: int = 64
+    ):
+        """Initialize the peer stream.
+
+        Args:
+            address: Address of the peer
+            open_stream: Stub method that opens a new stream-stream call
+            max_in_flight: Maximum number of writes awaiting an ACK
+        """
+        self.address = address
+        self._open_stream = open_stream
+        self._call: Optional[grpc.aio.StreamStreamCall] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Deque[asyncio.Future] = deque()
+        self._write_lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._logger = logging.getLogger(f"stream.{address}")
+
+    async def send(self, request: Any) -> replication_pb2.AckResponse:
+        """Write a request to the stream and wait for the matching ACK.
+
+        Args:
+            request: Message to write, or its serialized bytes when the
+                stream was opened without a request serializer
+
+        Returns:
+            AckResponse sent back by the peer for this request
+
+        Raises:
+            grpc.aio.AioRpcError: If the stream fails before the ACK arrives
+        """
+        async with self._in_flight:
+            future = asyncio.get_running_loop().create_future()
+            async with self._write_lock:
+                if self._call is None:
+                    self._open()
+                call = self._call
+                self._pending.append(future)
+                try:
+                    await call.write(request)
+                except asyncio.CancelledError:
+                    # The write may or may not have gone out, so later ACKs
+                    # can no longer be paired with their writes
+                    future.cancel()
+                    self._reset(call, ConnectionError(f"Write to {self.address} was cancelled"))
+                    raise
+                except Exception as e:
+                    self._reset(call, e)
+            return await future
+
+    async def close(self) -> None:
+        """Close the stream and fail any writes still waiting for an ACK."""
+        call = self._call
+        if call is not None:
+            self._reset(call, ConnectionError(f"Stream to {self.address} closed"))
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader_task = None
+
+    def _open(self) -> None:
+        """Open a new stream and start reading its ACKs."""
+        self._logger.debug("Opening update stream to %s", self.address)
+        self._call = self._open_stream()
+        self._reader_task = asyncio.create_task(self._read_acks(self._call))
+
+    async def _read_acks(self, call: grpc.aio.StreamStreamCall) -> None:
+        """Resolve pending writes in order as ACKs arrive on the stream."""
+        try:
+            while True:
+                response = await call.read()
+                if response is grpc.aio.EOF:
+                    raise ConnectionError(f"Stream to {self.address} closed by peer")
+                if self._pending:
+                    future = self._pending.popleft()
+                    if not future.done():
+                        future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._logger.warning("Update stream to %s failed: %s", self.address, e)
+            self._reset(call, e)
+
+    def _reset(self, call: grpc.aio.StreamStreamCall, error: Exception) -> None:
+        """Drop a failed stream so the next write reopens it."""
+        if call is not self._call:
+            return
+        self._call = None
+        call.cancel()
+        pending, self._pending = self._pending, deque()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
@@ -3,10 +3,16 @@ import asyncio
 import logging
 import grpc
 from typing import Dict, List
-from src.proto import replication_pb2, replication_pb2_grpc
+from src.proto import replication_pb2
 from src.node.base_node import BaseNode
+from src.node.channels import ChannelPool
 from src.replication.passive_replication import PassiveReplication
 
+_UPDATE = replication_pb2.Transaction.UPDATE
+
+# Successful ACKs carry no per-request state, so one instance is shared
+_ACK_OK = replication_pb2.AckResponse(success=True)
+
 class SecondLayerNode(BaseNode):
     def __init__(
         self,
@@ -19,7 +25,7 @@ class SecondLayerNode(BaseNode):
         super().__init__(node_id, 2, log_dir, port, PassiveReplication())
         self.is_primary = is_primary
         self.backup_addresses = backup_addresses or []
-        self.backup_stubs = {}  # Dictionary to store stubs by address
+        self.backup_pools = {}  # Dictionary to store channel pools by address
         self._logger = logging.getLogger(f"node.second_layer.{node_id}")
         self._logger.info(f"Initializing second layer node {node_id} (primary={is_primary})")
         if backup_addresses:
@@ -32,99 +38,90 @@ class SecondLayerNode(BaseNode):
 
         # Connect to backup/primary nodes
         for addr in self.backup_addresses:
-            await self._connect_to_backup(addr)
+            if addr not in self.backup_pools:
+                self._connect_to_backup(addr)
 
-        # Update replication strategy with connected stubs
-        if hasattr(self.replication, 'set_backup_stubs'):
-            self.replication.set_backup_stubs(list(self.backup_stubs.values()))
+        # Update replication strategy with connected pools
+        if hasattr(self.replication, 'set_backup_pools'):
+            self.replication.set_backup_pools(list(self.backup_pools.values()))
 
         self._logger.info(f"Second layer node {self.node_id} started successfully")
 
-    async def _connect_to_backup(self, address: str) -> None:
-        """Connect to a backup node with retries."""
-        max_retries = 5
-        retry_delay = 1.0
-
-        for attempt in range(max_retries):
-            try:
-                self._logger.debug(f"Creating channel to node at {address}")
-                channel = grpc.aio.insecure_channel(address)
-                stub = replication_pb2_grpc.NodeServiceStub(channel)
-
-                # Verify connection by getting node status
-                empty = replication_pb2.Empty()
-                await stub.GetNodeStatus(empty)
-
-                self._logger.info(f"Connected to node at {address}")
-                self.backup_stubs[address] = stub
-                return
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self._logger.debug(f"Attempt {attempt + 1} failed to connect to {address}: {e}")
-                    await asyncio.sleep(retry_delay)
-                else:
-                    self._logger.warning(f"Failed to connect to backup at {address} after {max_retries} attempts")
+    async def stop(self):
+        """Stop the second layer node."""
+        self._logger.info(f"Stopping second layer node {self.node_id}")
+        await asyncio.gather(*(pool.close() for pool in self.backup_pools.values()), return_exceptions=True)
+        await super().stop()
+
+    def _connect_to_backup(self, address: str) -> None:
+        """Open the channel pool to a backup node without waiting for it.
+
+        gRPC connects the channels in the background and keeps reconnecting
+        them, so an unreachable backup does not hold up start().
+        """
+        self._logger.debug("Creating channel pool to backup at %s", address)
+        self.backup_pools[address] = ChannelPool(address)
 
     async def ExecuteTransaction(
         self,
         request: replication_pb2.Transaction,
         context: grpc.aio.ServicerContext
     ) -> replication_pb2.TransactionResponse:
-        tx_type = "READ_ONLY" if request.type == replication_pb2.Transaction.READ_ONLY else "UPDATE"
-        self._logger.info(f"Received {tx_type} transaction with {len(request.operations)} operations")
+        is_update = request.type == _UPDATE
+        tx_type = "UPDATE" if is_update else "READ_ONLY"
+        self._logger.info("Received %s transaction with %s operations", tx_type, len(request.operations))
 
-        if request.type == replication_pb2.Transaction.UPDATE:
+        if is_update:
             error_msg = "Write operations not allowed"
-            self._logger.warning(f"Rejected {tx_type} transaction: {error_msg}")
-            raise Exception(error_msg)
+            self._logger.warning("Rejected %s transaction: %s", tx_type, error_msg)
+            await self._abort(context, grpc.StatusCode.INVALID_ARGUMENT, error_msg)
 
+        # One pass both rejects stray writes and collects the keys to read
+        keys = []
         for op in request.operations:
-            if op.HasField('write'):
+            kind = op.WhichOneof('operation')
+            if kind == 'read':
+                keys.append(op.read.key)
+            elif kind == 'write':
                 error_msg = "Write operations not allowed"
-                self._logger.warning(f"Rejected transaction with write operation: {error_msg}")
-                raise Exception(error_msg)
+                self._logger.warning("Rejected transaction with write operation: %s", error_msg)
+                await self._abort(context, grpc.StatusCode.INVALID_ARGUMENT, error_msg)
 
-        results = []
+        response = replication_pb2.TransactionResponse(success=True)
+        results = response.results
         try:
-            for i, op in enumerate(request.operations):
-                if op.HasField('read'):
-                    self._logger.debug(f"Processing read operation {i+1}/{len(request.operations)}: key={op.read.key}")
-                    item = await self.store.get(op.read.key)
-                    if item:
-                        self._logger.debug(f"Found value for key={op.read.key}: version={item.version}")
-                        results.append(item)
-                    else:
-                        self._logger.debug(f"No value found for key={op.read.key}")
-
-            self._logger.info(f"Successfully completed read transaction with {len(results)} results")
-            return replication_pb2.TransactionResponse(success=True, results=results)
-
+            items = await self.store.get_many(keys)
         except Exception as e:
-            self._logger.error(f"Read transaction failed: {e}", exc_info=True)
-            raise
+            self._logger.error("Read transaction failed: %s", e, exc_info=True)
+            await self._abort(context, grpc.StatusCode.INTERNAL, f"Read transaction failed: {e}")
+        if self._logger.isEnabledFor(logging.DEBUG):
+            for i, key in enumerate(keys):
+                item = items[key]
+                self._logger.debug("Read operation %s/%s: key=%s, version=%s",
+                                   i + 1, len(keys), key, item.version if item else None)
+        for key in keys:
+            item = items[key]
+            if item:
+                results.append(item)
+
+        self._logger.info("Successfully completed read transaction with %s results", len(results))
+        return response
 
     async def SyncUpdates(self, request: replication_pb2.UpdateGroup, context: grpc.aio.ServicerContext) -> replication_pb2.AckResponse:
-        self._logger.info(f"Received sync request from {request.source_node} with {len(request.updates)} updates")
+        self._logger.info("Received sync request from %s with %s updates", request.source_node, len(request.updates))
         try:
             # Don't reset counter, just process new updates
-            for update in request.updates:
-                # Only increment if we haven't seen this version before
-                current = await self.store.get(update.key)
-                if not current or current.version < update.version:
-                    await self.store.update(
-                        key=update.key,
-                        value=update.value,
-                        version=update.version
-                    )
-                    self.websocket_client.increment_update_count()
-                    self.websocket_client.update_sync_time()
-
-            if self.is_primary and self.backup_stubs:
+            # Only count updates we haven't seen this version of before
+            stored = await self.store.update_many(request.updates, newer_only=True)
+            if stored:
+                self.websocket_client.record_updates(len(stored))
+
+            if self.is_primary and self.backup_pools:
                 success = await self.replication.handle_update(request)
                 if not success:
                     return replication_pb2.AckResponse(success=False, message="Replication failed")
 
-            return replication_pb2.AckResponse(success=True)
+            return _ACK_OK
 
         except Exception as e:
             return replication_pb2.AckResponse(success=False, message=str(e))
@@ -136,20 +133,16 @@ class SecondLayerNode(BaseNode):
     ) -> replication_pb2.AckResponse:
         """Handle update propagation from primary node."""
         try:
-            # Store the update locally
+            # Store the update locally, unless a newer version already arrived
             data = request.data
-            await self.store.update(
-                key=data.key,
-                value=data.value,
-                version=data.version
-            )
+            if await self.store.update_if_newer(data.key, data.value, data.version) is None:
+                return _ACK_OK
 
             # Update monitoring stats
-            self.websocket_client.increment_update_count()
-            self.websocket_client.update_sync_time()
+            self.websocket_client.record_updates()
 
-            self._logger.info(f"Successfully processed update for key={data.key}")
-            return replication_pb2.AckResponse(success=True)
+            self._logger.debug("Successfully processed update for key=%s", data.key)
+            return _ACK_OK
 
         except Exception as e:
             error_msg = f"Failed to handle propagated update: {e}"
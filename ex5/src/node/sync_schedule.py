@@ -0,0 +1,84 @@
+"""Adaptive placement of the periodic sync to the next layer."""
+import time
+from typing import List, Optional
+
+
+class SyncSchedule:
+    """Picks how long to wait before the next sync from update arrival times.
+
+    Gaps between update arrivals are kept as a histogram over ``bins``
+    equal bins up to ``max_interval``, decayed exponentially so it follows
+    the recent rate. From that distribution a schedule of poll times is
+    laid out after the last arrival, each step
+
+        L_i = L_(i-1) + F(L_(i-1)) / p(L_(i-1))
+
+    with p the gap density and F its CDF. Polls are placed densely where
+    updates are likely to land and sparsely where they are not, so bursts
+    are picked up quickly while idle periods cost few syncs. Until enough
+    arrivals are seen the sync waits the full ``max_interval``.
+
+    Attributes:
+        min_interval: Shortest wait between syncs, in seconds
+        max_interval: Longest wait between syncs, in seconds
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        max_interval: float = 10.0,
+        bins: int = 32,
+        decay: float = 0.05
+    ):
+        """Initialize an empty schedule.
+
+        Args:
+            min_interval: Shortest wait between syncs, in seconds
+            max_interval: Longest wait between syncs, in seconds
+            bins: Number of histogram bins between 0 and max_interval
+            decay: Weight of each new gap against the histogram so far
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._width = max_interval / bins
+        self._decay = decay
+        self._histogram: List[float] = [0.0] * bins
+        self._last_arrival: Optional[float] = None
+
+    def record_arrival(self, now: Optional[float] = None) -> None:
+        """Add the gap since the previous arrival to the histogram."""
+        if now is None:
+            now = time.monotonic()
+        if self._last_arrival is not None:
+            gap = now - self._last_arrival
+            index = min(int(gap / self._width), len(self._histogram) - 1)
+            keep = 1.0 - self._decay
+            histogram = self._histogram
+            for i in range(len(histogram)):
+                histogram[i] *= keep
+            histogram[index] += self._decay
+        self._last_arrival = now
+
+    def next_interval(self, now: Optional[float] = None) -> float:
+        """Return how long to wait before the next sync, in seconds."""
+        total = sum(self._histogram)
+        if self._last_arrival is None or total == 0.0:
+            return self.max_interval
+        if now is None:
+            now = time.monotonic()
+        elapsed = now - self._last_arrival
+        if elapsed >= self.max_interval:
+            return self.max_interval
+
+        # Walk the poll schedule until it passes the time already elapsed
+        histogram = self._histogram
+        width = self._width
+        poll = width
+        while poll <= elapsed:
+            index = int(poll / width)
+            if histogram[index] == 0.0:
+                # No gaps land here, so nothing is gained by polling soon
+                return self.max_interval
+            # F(L) / p(L), with both scaled by the same histogram total
+            poll += width * sum(histogram[:index + 1]) / histogram[index]
+        return min(max(poll - elapsed, self.min_interval), self.max_interval)
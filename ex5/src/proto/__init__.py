@@ -1,4 +1,19 @@
 """Protocol buffer definitions for the replication system."""
+import logging
+import os
+
+# Prefer the compiled protobuf backend; the pure-Python one is many times
+# slower at building and serializing the messages sent on every update.
+os.environ.setdefault('PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION', 'upb')
+
+from google.protobuf.internal import api_implementation
+
+if api_implementation.Type() not in ('upb', 'cpp'):
+    logging.getLogger("proto").warning(
+        "Using the pure-Python protobuf backend (%s); replication will be slow",
+        api_implementation.Type()
+    )
+
 from .replication_pb2 import *
 from .replication_pb2_grpc import *
 
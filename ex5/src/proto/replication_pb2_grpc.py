@@ -44,11 +44,21 @@ class NodeServiceStub(object):
                 request_serializer=src_dot_proto_dot_replication__pb2.UpdateNotification.SerializeToString,
                 response_deserializer=src_dot_proto_dot_replication__pb2.AckResponse.FromString,
                 _registered_method=True)
+        self.PropagateUpdateStream = channel.stream_stream(
+                '/replication.NodeService/PropagateUpdateStream',
+                request_serializer=src_dot_proto_dot_replication__pb2.UpdateNotification.SerializeToString,
+                response_deserializer=src_dot_proto_dot_replication__pb2.AckResponse.FromString,
+                _registered_method=True)
         self.SyncUpdates = channel.unary_unary(
                 '/replication.NodeService/SyncUpdates',
                 request_serializer=src_dot_proto_dot_replication__pb2.UpdateGroup.SerializeToString,
                 response_deserializer=src_dot_proto_dot_replication__pb2.AckResponse.FromString,
                 _registered_method=True)
+        self.SyncUpdatesStream = channel.stream_stream(
+                '/replication.NodeService/SyncUpdatesStream',
+                request_serializer=src_dot_proto_dot_replication__pb2.UpdateGroup.SerializeToString,
+                response_deserializer=src_dot_proto_dot_replication__pb2.AckResponse.FromString,
+                _registered_method=True)
         self.NotifyLayerSync = channel.unary_unary(
                 '/replication.NodeService/NotifyLayerSync',
                 request_serializer=src_dot_proto_dot_replication__pb2.LayerSyncNotification.SerializeToString,
@@ -76,12 +86,24 @@ class NodeServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PropagateUpdateStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SyncUpdates(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SyncUpdatesStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def NotifyLayerSync(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -107,11 +129,21 @@ def add_NodeServiceServicer_to_server(servicer, server):
                     request_deserializer=src_dot_proto_dot_replication__pb2.UpdateNotification.FromString,
                     response_serializer=src_dot_proto_dot_replication__pb2.AckResponse.SerializeToString,
             ),
+            'PropagateUpdateStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.PropagateUpdateStream,
+                    request_deserializer=src_dot_proto_dot_replication__pb2.UpdateNotification.FromString,
+                    response_serializer=src_dot_proto_dot_replication__pb2.AckResponse.SerializeToString,
+            ),
             'SyncUpdates': grpc.unary_unary_rpc_method_handler(
                     servicer.SyncUpdates,
                     request_deserializer=src_dot_proto_dot_replication__pb2.UpdateGroup.FromString,
                     response_serializer=src_dot_proto_dot_replication__pb2.AckResponse.SerializeToString,
             ),
+            'SyncUpdatesStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.SyncUpdatesStream,
+                    request_deserializer=src_dot_proto_dot_replication__pb2.UpdateGroup.FromString,
+                    response_serializer=src_dot_proto_dot_replication__pb2.AckResponse.SerializeToString,
+            ),
             'NotifyLayerSync': grpc.unary_unary_rpc_method_handler(
                     servicer.NotifyLayerSync,
                     request_deserializer=src_dot_proto_dot_replication__pb2.LayerSyncNotification.FromString,
@@ -187,6 +219,33 @@ class NodeService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def PropagateUpdateStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/replication.NodeService/PropagateUpdateStream',
+            src_dot_proto_dot_replication__pb2.UpdateNotification.SerializeToString,
+            src_dot_proto_dot_replication__pb2.AckResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def SyncUpdates(request,
             target,
@@ -214,6 +273,33 @@ class NodeService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SyncUpdatesStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/replication.NodeService/SyncUpdatesStream',
+            src_dot_proto_dot_replication__pb2.UpdateGroup.SerializeToString,
+            src_dot_proto_dot_replication__pb2.AckResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def NotifyLayerSync(request,
             target,
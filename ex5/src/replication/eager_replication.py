@@ -5,28 +5,52 @@ from typing import List, Optional
 from src.proto import replication_pb2
 from src.replication.base_replication import BaseReplication
 
+# Successful ACKs carry no per-request state, so one instance is shared
+_ACK_OK = replication_pb2.AckResponse(success=True)
+
 class EagerReplication(BaseReplication):
     """Eager replication strategy for core layer nodes.
 
     Implements update-everywhere, active replication where:
     - All nodes process the same operations
     - Updates are propagated immediately
-    - Waits for acknowledgment from all nodes before proceeding
+    - Waits for acknowledgment from all nodes (or a majority of them, when
+      configured) before proceeding
     """
 
-    def __init__(self) -> None:
-        """Initialize eager replication strategy."""
+    def __init__(self, require_all_acks: bool = True) -> None:
+        """Initialize eager replication strategy.
+
+        Args:
+            require_all_acks: Wait for every peer to acknowledge an update.
+                When False, an update is committed as soon as a majority of
+                the core layer (this node included) has applied it, and the
+                remaining peers finish in the background.
+        """
         super().__init__(propagation_type='active', consistency_type='eager')
-        self._transaction_lock = asyncio.Lock()
         self._logger = logging.getLogger("replication.eager")
         self._propagation_timeout = 5.0
-        self.node = None
+        self._require_all_acks = require_all_acks
+        self._straggler_tasks = set()
+        self._commit_queue: asyncio.Queue = asyncio.Queue()
+        self._commit_task: Optional[asyncio.Task] = None
         self._logger.info("Initialized eager replication strategy")
 
-    def attach_node(self, node):
-        """Attach this replication strategy to a node."""
-        self.node = node
-        self._logger.info(f"Attached to node {node.node_id}")
+    async def start(self) -> None:
+        """Start applying propagated updates in the background."""
+        await super().start()
+        self._commit_task = asyncio.create_task(self._commit_loop())
+
+    async def stop(self) -> None:
+        """Stop applying propagated updates."""
+        if self._commit_task:
+            self._commit_task.cancel()
+            try:
+                await self._commit_task
+            except asyncio.CancelledError:
+                pass
+            self._commit_task = None
+        await super().stop()
 
     async def sync(self) -> None:
         """Synchronize state with peers.
@@ -44,31 +68,64 @@ class EagerReplication(BaseReplication):
             if not data_item:
                 raise ValueError("No data item in update notification")
 
-            self._logger.info(
-                f"Handling update for key={data_item.key}, "
-                f"value={data_item.value}, "
-                f"version={data_item.version}"
+            self._logger.debug(
+                "Handling update for key=%s, value=%s, version=%s",
+                data_item.key, data_item.value, data_item.version
             )
 
-            for peer_stub in self.node.peer_stubs.values():
-                try:
-                    await peer_stub.PropagateUpdate(update_notification)
-                except Exception as e:
-                    self._logger.error(f"Failed to propagate to peer: {e}")
-                    raise
+            payload = update_notification.SerializeToString()
+            timeout = self._propagation_timeout
+            pending = {
+                asyncio.create_task(asyncio.wait_for(send(payload), timeout)): address
+                for address, send in self.node.peer_senders
+            }
+            if not pending:
+                return True
+
+            # The local write counts towards the majority
+            needed = len(pending) if self._require_all_acks else (len(pending) + 1) // 2
+            allowed_failures = len(pending) - needed
+            acks = failures = 0
+            remaining = set(pending)
+            try:
+                while acks < needed:
+                    done, remaining = await asyncio.wait(remaining, return_when=asyncio.FIRST_COMPLETED)
+                    # Every finished task is looked at before giving up, so
+                    # none is left with an exception nobody retrieved
+                    last_error = None
+                    for task in done:
+                        address = pending[task]
+                        error = task.exception()
+                        if error is None and not task.result().success:
+                            error = RuntimeError(task.result().message)
+                        if error is None:
+                            acks += 1
+                            continue
+                        self._logger.error("Failed to propagate to peer %s: %s", address, error)
+                        failures += 1
+                        last_error = error
+                    if failures > allowed_failures:
+                        raise last_error
+            finally:
+                for task in remaining:
+                    self._straggler_tasks.add(task)
+                    task.add_done_callback(self._on_straggler_done)
 
             return True
         except Exception as e:
-            self._logger.error(f"Failed to handle update: {e}")
+            self._logger.error("Failed to handle update: %s", e)
             raise
 
-    async def _rollback(self, data_item: replication_pb2.DataItem) -> None:
-        """Rollback a failed update."""
-        try:
-            self._logger.warning(f"Starting rollback for key={data_item.key}")
-            self._logger.warning(f"Rolling back update for key {data_item.key}")
-        except Exception as e:
-            self._logger.error(f"Rollback failed: {e}", exc_info=True)
+    def _on_straggler_done(self, task: asyncio.Task) -> None:
+        """Log the outcome of a propagation that finished after commit."""
+        self._straggler_tasks.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self._logger.warning("Late propagation to peer failed: %s", error)
+        elif not task.result().success:
+            self._logger.warning("Late propagation to peer rejected: %s", task.result().message)
 
     async def PropagateUpdate(self, request: replication_pb2.UpdateNotification, context: grpc.aio.ServicerContext) -> replication_pb2.AckResponse:
         """Handle update propagation from peer nodes.
@@ -81,20 +138,48 @@ class EagerReplication(BaseReplication):
             AckResponse indicating success or failure
         """
         update = request.data
-        self._logger.info(f"Received update propagation from {request.source_node} for key={update.key}")
+        self._logger.debug("Received update propagation from %s for key=%s", request.source_node, update.key)
 
         try:
-            self._logger.debug(f"Applying propagated update to local store: key={update.key}, value={update.value}, version={update.version}")
-            await self.node.store.update(
-                key=update.key,
-                value=update.value,
-                version=update.version
-            )
-            self.node.websocket_client.increment_update_count()
-            self.node.websocket_client.update_sync_time()
+            applied = asyncio.get_running_loop().create_future()
+            self._commit_queue.put_nowait((update, applied))
+            await applied
 
-            self._logger.info(f"Successfully applied propagated update for key={update.key}")
-            return replication_pb2.AckResponse(success=True)
+            self._logger.debug("Successfully applied propagated update for key=%s", update.key)
+            return _ACK_OK
         except Exception as e:
-            self._logger.error(f"Failed to apply propagated update: {e}", exc_info=True)
+            self._logger.error("Failed to apply propagated update: %s", e, exc_info=True)
             return replication_pb2.AckResponse(success=False, message=str(e))
+
+    async def _commit_loop(self) -> None:
+        """Apply propagated updates in groups.
+
+        Every update queued while the previous group was being stored is
+        applied with one store call, so concurrent peers share a single
+        write to the operations log. Callers are answered once their
+        group is stored.
+        """
+        while True:
+            batch = [await self._commit_queue.get()]
+            while not self._commit_queue.empty():
+                batch.append(self._commit_queue.get_nowait())
+            try:
+                await self._apply_batch([update for update, _ in batch])
+            except Exception as e:
+                for _, applied in batch:
+                    if not applied.done():
+                        applied.set_exception(e)
+            else:
+                for _, applied in batch:
+                    if not applied.done():
+                        applied.set_result(None)
+
+    async def _apply_batch(self, updates: List[replication_pb2.DataItem]) -> None:
+        """Store the updates in a batch that are newer than the local copy."""
+        stored = await self.node.store.update_many(updates, newer_only=True)
+        self._logger.debug("Applied %s of %s propagated updates to local store", len(stored), len(updates))
+        for data_item in stored:
+            self.node._record_update(data_item)
+        self.node._maybe_notify_first_layer()
+        if stored:
+            self.node.websocket_client.record_updates(len(stored))
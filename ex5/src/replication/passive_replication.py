@@ -1,9 +1,13 @@
 """Passive replication strategy for first and second layers."""
 import asyncio
 import logging
-from typing import List, Optional
+import grpc
+from typing import Dict, List, Optional
+from src.node.channels import ChannelPool, compression_for
+from src.node.peer_stream import PeerStream
 from src.proto import replication_pb2
 from src.replication.base_replication import BaseReplication
+from src.storage.data_store import latest_per_key
 import time
 
 class PassiveReplication(BaseReplication):
@@ -18,12 +22,28 @@ class PassiveReplication(BaseReplication):
         """Initialize passive replication strategy."""
         super().__init__(propagation_type='passive', consistency_type='lazy')
         self._logger = logging.getLogger("replication.passive")
-        self.backup_stubs = []
+        self.backup_pools = []
+        self._backup_streams: Dict[str, PeerStream] = {}
 
-    def set_backup_stubs(self, stubs: List) -> None:
-        """Set the backup stubs after initialization."""
-        self.backup_stubs = stubs
-        self._logger.debug(f"Set {len(stubs)} backup stubs")
+    def set_backup_pools(self, pools: List) -> None:
+        """Set the channel pools to the backups after initialization.
+
+        One update stream is kept open to each backup, so groups are
+        pipelined over it instead of paying for a new call each time.
+        """
+        # Streams already opened to a pool are kept rather than replaced
+        streams = self._backup_streams
+        self.backup_pools = pools
+        self._backup_streams = {
+            pool.address: streams.get(pool.address) or PeerStream(pool.address, self._sync_stream(pool))
+            for pool in pools
+        }
+        self._logger.debug(f"Set {len(pools)} backup pools")
+
+    async def stop(self) -> None:
+        """Close the update streams to the backups."""
+        await asyncio.gather(*(stream.close() for stream in self._backup_streams.values()), return_exceptions=True)
+        await super().stop()
 
     async def sync(self) -> None:
         """Synchronize state with backup nodes.
@@ -37,7 +57,7 @@ class PassiveReplication(BaseReplication):
         try:
             # Get all current data
             updates = await self.node.store.get_all()
-            if not updates or not self.backup_stubs:
+            if not updates or not self.backup_pools:
                 return
 
             # Create sync notification
@@ -51,9 +71,9 @@ class PassiveReplication(BaseReplication):
             )
 
             # Send to all backups
-            for stub in self.backup_stubs:
+            for pool in self.backup_pools:
                 try:
-                    await stub.NotifyLayerSync(notification)
+                    await pool.stub().NotifyLayerSync(notification)
                     self._logger.info(f"Synced {len(updates)} updates to backup")
                 except Exception as e:
                     self._logger.error(f"Failed to sync with backup: {e}")
@@ -71,27 +91,87 @@ class PassiveReplication(BaseReplication):
             self._logger.error(f"Failed to get updates from primary: {e}")
             return []
 
+    @staticmethod
+    def _sync_updates(pool: ChannelPool) -> grpc.aio.UnaryUnaryMultiCallable:
+        """Bind SyncUpdates on the pool's next channel to take serialized requests."""
+        return pool.channel().unary_unary(
+            '/replication.NodeService/SyncUpdates',
+            request_serializer=None,
+            response_deserializer=replication_pb2.AckResponse.FromString
+        )
+
+    @staticmethod
+    def _sync_stream(pool: ChannelPool) -> grpc.aio.StreamStreamMultiCallable:
+        """Bind SyncUpdatesStream on one of the pool's channels to take serialized requests."""
+        return pool.channel().stream_stream(
+            '/replication.NodeService/SyncUpdatesStream',
+            request_serializer=None,
+            response_deserializer=replication_pb2.AckResponse.FromString
+        )
+
     async def handle_update(self, update_group: replication_pb2.UpdateGroup) -> bool:
-        """Handle updates in the passive replication strategy."""
+        """Handle updates in the passive replication strategy.
+
+        The group is sent to all backups at once. It counts as replicated
+        while a majority of the layer, the primary included, holds it, so
+        one failed backup out of several does not fail the whole sync.
+        """
         try:
-            if not self.backup_stubs:
+            if not self.backup_pools:
                 return True  # No backups to propagate to
 
-            # Convert each update in the group to an UpdateNotification
-            for update in update_group.updates:
-                notification = replication_pb2.UpdateNotification(
-                    data=update,
-                    source_node=self.node.node_id  # This ensures backup sees primary as source
-                )
-
-                for stub in self.backup_stubs:
-                    try:
-                        await stub.PropagateUpdate(notification)
-                    except Exception as e:
-                        self._logger.error(f"Failed to propagate to backup: {e}")
-                        return False
-
-            return True
+            failed = await self.replicate(update_group.updates, self.backup_pools)
+            acks = 1 + len(self.backup_pools) - len(failed)  # The primary already holds the updates
+            return acks > (len(self.backup_pools) + 1) // 2
         except Exception as e:
             self._logger.error(f"Failed to handle update: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    async def replicate(
+        self,
+        updates: List[replication_pb2.DataItem],
+        pools: List[ChannelPool]
+    ) -> List[ChannelPool]:
+        """Send updates to some of the backups as one group.
+
+        Args:
+            updates: Updates to send; only the latest version of each key goes out
+            pools: Pools of the backups to send them to
+
+        Returns:
+            The pools of the backups that did not acknowledge the group
+        """
+        # Send the whole group to each backup in a single message
+        # Backups only need the latest version of each key
+        updates = latest_per_key(updates)
+        notification = replication_pb2.UpdateGroup(
+            updates=updates,
+            source_node=self.node.node_id,  # This ensures backup sees primary as source
+            layer=self.node.layer,
+            update_count=len(updates)
+        )
+
+        # Serialized once here rather than by gRPC for every backup
+        payload = notification.SerializeToString()
+        compression = compression_for(len(payload))
+        self._logger.debug("Propagating %s bytes to %s backups (compression=%s)",
+                           len(payload), len(pools), compression)
+
+        # The sends are independent, so go to all backups at once.
+        # Compression is fixed per call, so groups large enough to be
+        # compressed use a unary call of their own instead of the stream.
+        if compression is None:
+            sends = (self._backup_streams[pool.address].send(payload) for pool in pools)
+        else:
+            sends = (self._sync_updates(pool)(payload, compression=compression) for pool in pools)
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        failed = []
+        # Results come back in pools order, so failures can be named
+        for pool, result in zip(pools, results):
+            if isinstance(result, Exception):
+                self._logger.error("Failed to propagate to backup %s: %s", pool.address, result)
+                failed.append(pool)
+            elif not result.success:
+                self._logger.error("Backup %s rejected updates: %s", pool.address, result.message)
+                failed.append(pool)
+        return failed
@@ -4,6 +4,11 @@ import subprocess
 import sys
 from manual_test import main as test_main
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
+
 async def run_system():
     """Run the web server and test system."""
     server_process = subprocess.Popen(
@@ -18,4 +23,7 @@ async def run_system():
         server_process.wait()
 
 if __name__ == "__main__":
-    asyncio.run(run_system())
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(run_system())
+    else:
+        asyncio.run(run_system())
@@ -1,18 +1,36 @@
 """Data store implementation for version management."""
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, Optional, List, Tuple
 import logging
 import json
 from pathlib import Path
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from src.proto import replication_pb2
 
+
+def latest_per_key(items: Iterable[replication_pb2.DataItem]) -> List[replication_pb2.DataItem]:
+    """Keep only the highest version of each key, in order of first appearance.
+
+    Older versions of a key would be overwritten downstream anyway, so
+    batches are compacted with this before they are stored or sent on.
+    """
+    latest: Dict[int, replication_pb2.DataItem] = {}
+    for item in items:
+        current = latest.get(item.key)
+        if current is None or item.version > current.version:
+            latest[item.key] = item
+    return list(latest.values())
+
+
 class DataStore:
     def __init__(self, node_id: str, log_dir: str):
         self._data: Dict[int, replication_pb2.DataItem] = {}
         self._update_history = deque(maxlen=100)  # Keep last 100 updates
         self.node_id = node_id
         self.current_version = 0
+        # Local change sequence; keys are kept in the order they last changed
+        self.change_sequence = 0
+        self._changed: 'OrderedDict[int, int]' = OrderedDict()
         self._logger = logging.getLogger(f"storage.{node_id}")
 
         self._log_dir = Path(log_dir)
@@ -22,43 +40,165 @@ class DataStore:
     async def get(self, key: int) -> Optional[replication_pb2.DataItem]:
         return self._data.get(key)
 
+    async def get_many(self, keys: Iterable[int]) -> Dict[int, Optional[replication_pb2.DataItem]]:
+        """Look up several keys in one call, mapping missing keys to None.
+
+        The data is held in memory, so one call for a transaction's reads
+        beats awaiting a get per key, concurrently or not.
+        """
+        return {key: self._data.get(key) for key in keys}
+
     async def get_all(self) -> List[replication_pb2.DataItem]:
         return list(self._data.values())
 
-    async def update(self, key: int, value: int, version: int) -> replication_pb2.DataItem:
+    def items(self) -> Iterable[replication_pb2.DataItem]:
+        """Return a live view of the stored items, without copying them into a list."""
+        return self._data.values()
+
+    async def update(self, key: int, value: int, version: int, timestamp: Optional[int] = None) -> replication_pb2.DataItem:
+        """Store a new version of a key and return the stored item.
+
+        The returned DataItem is the one kept by the store, so callers can
+        send it on without building another message.
+        """
+        item, log_entry = self._apply(key, value, version, timestamp)
+        self._write_log([log_entry])
+        return item
+
+    async def update_if_newer(
+        self,
+        key: int,
+        value: int,
+        version: int,
+        timestamp: Optional[int] = None
+    ) -> Optional[replication_pb2.DataItem]:
+        """Store an update unless the stored version is the same or newer.
+
+        The version check and the write happen in one call, so no other
+        write to the key can land between them.
+
+        Returns:
+            The stored item, or None when the update was skipped
+        """
+        current = self._data.get(key)
+        if current is not None and current.version >= version:
+            return None
+        return await self.update(key, value, version, timestamp)
+
+    async def update_many(
+        self,
+        items: Iterable[replication_pb2.DataItem],
+        newer_only: bool = False
+    ) -> List[replication_pb2.DataItem]:
+        """Store several updates at once and return the stored items.
+
+        The updates are applied in order and logged with a single write to
+        the operations log. Items without a timestamp share one taken for
+        the whole batch.
+
+        Args:
+            items: Updates to store
+            newer_only: Skip items whose version is not ahead of the stored
+                one, checked as the batch is applied so earlier items of
+                the batch count too
+        """
+        stored = []
+        log_entries = []
+        now = int(time.time())
+        if newer_only:
+            # Older versions in the batch would be skipped or overwritten
+            items = latest_per_key(items)
+        for data_item in items:
+            if newer_only:
+                current = self._data.get(data_item.key)
+                if current is not None and current.version >= data_item.version:
+                    continue
+            item, log_entry = self._apply(
+                data_item.key,
+                data_item.value,
+                data_item.version,
+                data_item.timestamp or now
+            )
+            stored.append(item)
+            log_entries.append(log_entry)
+        self._write_log(log_entries)
+        return stored
+
+    def _apply(self, key: int, value: int, version: int, timestamp: Optional[int]):
+        """Store an item in memory and return it with its log entry."""
         if key < 0 or version < 0:
             raise ValueError("Key and version must be non-negative")
 
+        if timestamp is None:
+            timestamp = int(time.time())
         item = replication_pb2.DataItem(
             key=key,
             value=value,
-            version=version
+            version=version,
+            timestamp=timestamp
         )
         self._data[key] = item
         self._update_history.append(item)
+        self.change_sequence += 1
+        self._changed[key] = self.change_sequence
+        self._changed.move_to_end(key)
+        # Keep locally issued versions ahead of any version seen from a peer
+        if version > self.current_version:
+            self.current_version = version
 
         log_entry = {
             'operation': 'UPDATE',
-            'timestamp': int(time.time()),
+            'timestamp': timestamp,
             'node_id': self.node_id,
             'key': key,
             'value': value,
             'version': version
         }
+        return item, log_entry
 
+    def _write_log(self, log_entries: List[dict]) -> None:
+        """Append entries to the operations log."""
+        if not log_entries:
+            return
         with self._log_file.open('a') as f:
-            json.dump(log_entry, f)
-            f.write('\n')
+            for log_entry in log_entries:
+                json.dump(log_entry, f)
+                f.write('\n')
 
-        return item
+    async def write_next(self, key: int, value: int) -> replication_pb2.DataItem:
+        """Store a value under the next local version and return the stored item.
+
+        Taking the version and storing the item happen in one call, so no
+        other write can slip in between them.
+        """
+        return await self.update(key, value, self.current_version + 1)
 
     def get_next_version(self) -> int:
         self.current_version += 1
         return self.current_version
 
+    def get_changes_since(self, sequence: int) -> List[Tuple[int, replication_pb2.DataItem]]:
+        """Get the current items of keys changed after a change sequence.
+
+        Each key appears once, at its latest version, paired with the change
+        sequence it was stored at, oldest first. Only the keys changed since
+        then are visited, so the cost follows the size of the delta rather
+        than of the store. A caller sending only part of the delta can
+        resume from the sequence of the last item it sent.
+        """
+        changes = []
+        for key in reversed(self._changed):
+            changed_at = self._changed[key]
+            if changed_at <= sequence:
+                break
+            changes.append((changed_at, self._data[key]))
+        changes.reverse()
+        return changes
+
     def get_recent_updates(self, count: int) -> List[replication_pb2.DataItem]:
         """Get the most recent updates."""
         return list(self._update_history)[-count:]
 
     async def close(self):
         self._data.clear()
+        self._changed.clear()
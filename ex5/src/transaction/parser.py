@@ -1,7 +1,10 @@
 """Transaction parser module for handling transaction strings."""
+import logging
 from typing import List
 from src.proto import replication_pb2
 
+logger = logging.getLogger("transaction.parser")
+
 class TransactionParser:
     """Class for parsing transaction strings into protobuf Transaction messages."""
 
@@ -29,14 +32,13 @@ class TransactionParser:
     def _parse_write(self, op_str: str) -> replication_pb2.Operation:
         """Parse WRITE operation into protobuf Operation."""
         try:
-            print("\nDebug _parse_write:")
-            print(f"Input op_str: {op_str}")
+            logger.debug("Parsing write operation: %s", op_str)
 
             start = op_str.index('(')
             end = op_str.rindex(')')
             content = op_str[start + 1:end]
             key_str, value_str = content.split(',')
-            print(f"Parsed key_str: {key_str}, value_str: {value_str}")
+            logger.debug("Parsed key_str: %s, value_str: %s", key_str, value_str)
 
             op = replication_pb2.Operation()
             write_op = replication_pb2.WriteOperation()
@@ -45,17 +47,15 @@ class TransactionParser:
 
             op.write.CopyFrom(write_op)
 
-            print(f"Final operation: {op}")
+            logger.debug("Final operation: %s", op)
             return op
         except Exception as e:
-            print(f"\nError in _parse_write:")
-            print(f"Exception type: {type(e)}")
-            print(f"Exception message: {str(e)}")
+            logger.debug("Error in _parse_write: %s: %s", type(e).__name__, e)
             raise ValueError(f"Invalid write operation: {op_str}") from e
 
     def parse(self, tx_str: str) -> replication_pb2.Transaction:
         """Parse a complete transaction string into a protobuf Transaction."""
-        print(f"\nParsing transaction: {tx_str}")
+        logger.debug("Parsing transaction: %s", tx_str)
         tx = replication_pb2.Transaction()
 
         if not tx_str.startswith('b') or not tx_str.endswith('c'):
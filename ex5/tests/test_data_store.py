@@ -0,0 +1,57 @@
+"""Tests for the data store change cursor used by the second layer sync."""
+import pytest
+
+from src.storage.data_store import DataStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DataStore("test", str(tmp_path))
+
+
+async def test_nothing_changed_since_current_sequence(store):
+    assert store.get_changes_since(0) == []
+    await store.update(1, 10, 1)
+    assert store.get_changes_since(store.change_sequence) == []
+
+
+async def test_changes_come_oldest_first_once_per_key(store):
+    await store.update(1, 10, 1)
+    await store.update(2, 20, 1)
+    await store.update(3, 30, 1)
+    await store.update(1, 11, 2)
+
+    changes = store.get_changes_since(0)
+
+    assert [item.key for _, item in changes] == [2, 3, 1]
+    sequences = [sequence for sequence, _ in changes]
+    assert sequences == sorted(sequences)
+    assert sequences[-1] == store.change_sequence
+    # A key changed twice is returned once, at its latest version
+    assert (changes[-1][1].value, changes[-1][1].version) == (11, 2)
+
+
+async def test_cursor_resumes_after_partial_send(store):
+    await store.update(1, 10, 1)
+    await store.update(2, 20, 1)
+    await store.update(3, 30, 1)
+
+    # Only the first two changes were sent before the cursor was saved
+    sent = store.get_changes_since(0)[:2]
+    cursor = sent[-1][0]
+    await store.update(1, 11, 2)
+
+    resumed = store.get_changes_since(cursor)
+
+    assert [(item.key, item.version) for _, item in resumed] == [(3, 1), (1, 2)]
+
+
+async def test_skipped_updates_do_not_move_the_cursor(store):
+    item = await store.update(1, 10, 2)
+    sequence = store.change_sequence
+
+    stored = await store.update_many([item], newer_only=True)
+
+    assert stored == []
+    assert store.change_sequence == sequence
+    assert store.get_changes_since(sequence) == []
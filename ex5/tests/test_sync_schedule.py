@@ -0,0 +1,43 @@
+"""Tests for the adaptive second layer sync schedule."""
+from src.node.sync_schedule import SyncSchedule
+
+
+def regular_schedule(gap: float, arrivals: int = 50) -> SyncSchedule:
+    """Return a schedule that has seen arrivals every gap seconds, the last at 0."""
+    schedule = SyncSchedule()
+    for i in range(arrivals):
+        schedule.record_arrival(now=(i - arrivals + 1) * gap)
+    return schedule
+
+
+def test_empty_histogram_waits_max_interval():
+    schedule = SyncSchedule()
+    assert schedule.next_interval(now=0.0) == schedule.max_interval
+
+    # A single arrival gives no gap to learn from yet
+    schedule.record_arrival(now=0.0)
+    assert schedule.next_interval(now=0.5) == schedule.max_interval
+
+
+def test_next_interval_stays_within_bounds():
+    for gap in (0.05, 0.5, 2.0, 7.0, 30.0):
+        schedule = regular_schedule(gap)
+        for elapsed in (0.0, 0.1, 0.4, 1.0, 3.0, 9.9, 10.0, 50.0):
+            interval = schedule.next_interval(now=elapsed)
+            assert schedule.min_interval <= interval <= schedule.max_interval
+
+
+def test_polls_soon_while_updates_are_expected():
+    schedule = regular_schedule(0.5)
+    assert schedule.next_interval(now=0.0) == schedule.min_interval
+
+
+def test_backs_off_once_past_the_usual_gap():
+    schedule = regular_schedule(0.5)
+    # No gap as long as this was ever seen, so nothing is gained by polling soon
+    assert schedule.next_interval(now=0.7) == schedule.max_interval
+
+
+def test_waits_max_interval_after_long_silence():
+    schedule = regular_schedule(0.5)
+    assert schedule.next_interval(now=schedule.max_interval) == schedule.max_interval